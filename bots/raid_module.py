@@ -81,27 +81,14 @@ class RaidController:
         return False
     
     def find_nearest_meat(self, controller, bot_x: int, bot_y: int) -> Optional[Tuple[int, int]]:
-        best_dist = 9999
-        best_pos = None
-        m = controller.get_map()
+        team = controller.get_enemy_team()
         
-        for x in range(m.width):
-            for y in range(m.height):
-                tile = m.tiles[x][y]
-                
-                # Check if tile can hold items
-                if tile.tile_name in ["COUNTER", "BOX"] and tile.item is not None:
-                    item_dict = controller.item_to_public_dict(tile.item)
-                    
-                    # Check if it's meat
-                    if item_dict and item_dict.get('type') == 'Food':
-                        if item_dict.get('food_name') == 'MEAT':
-                            dist = max(abs(bot_x - x), abs(bot_y - y))
-                            if dist < best_dist:
-                                best_dist = dist
-                                best_pos = (x, y)
+        # nearest first, only meat lying on counters or in boxes (not in pans)
+        for tile in controller.get_tiles(team, controller.find_items(team, "MEAT", near=(bot_x, bot_y))):
+            if tile.tile_name in ["COUNTER", "BOX"]:
+                return (tile.x, tile.y)
         
-        return best_pos
+        return None
     
     def find_nearest_trash(self, controller, bot_x: int, bot_y: int) -> Optional[Tuple[int, int]]:
         best_dist = 9999
@@ -0,0 +1,151 @@
+# forward_model.py
+"""
+Forward model so search-based bots can simulate turns ahead.
+
+A ForwardModel owns its own GameState (normally a GameState.clone()) plus a quiet
+RobotController per team, so actions are applied with exactly the same rules as the real game.
+
+Actions are tuples of a RobotController method name and its arguments, e.g.
+    ("move", bot_id, dx, dy)
+    ("buy", bot_id, FoodType.MEAT, x, y)
+    ("switch_maps",)
+
+To search without copying, wrap steps in game_state.push_checkpoint() / game_state.rollback().
+
+Benchmark:
+    python src/forward_model.py --map maps/map1.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from game_constants import Team
+from game_state import GameState
+from robot_controller import RobotController
+
+
+Action = Tuple[Any, ...]
+
+#only the public actions of RobotController are allowed in a forward model
+ACTIONS = {
+    "move",
+    "pickup",
+    "place",
+    "trash",
+    "buy",
+    "chop",
+    "start_cook",
+    "take_from_pan",
+    "take_clean_plate",
+    "put_dirty_plate_in_sink",
+    "wash_sink",
+    "add_food_to_plate",
+    "submit",
+    "switch_maps",
+    "move_to",
+    "cancel_move_to",
+}
+
+
+def apply_actions(controller: RobotController, actions: Optional[Sequence[Action]]) -> List[bool]:
+    '''apply the actions in order through the controller, returns whether each one succeeded'''
+    results: List[bool] = []
+    for action in actions or ():
+        name = action[0]
+        if name not in ACTIONS:
+            raise ValueError(f"unknown forward model action: {name}")
+        results.append(bool(getattr(controller, name)(*action[1:])))
+    return results
+
+
+def step(
+    game_state: GameState,
+    actions_red: Optional[Sequence[Action]],
+    actions_blue: Optional[Sequence[Action]],
+    red_controller: Optional[RobotController] = None,
+    blue_controller: Optional[RobotController] = None,
+) -> Tuple[List[bool], List[bool]]:
+    '''
+    advance game_state by one full turn: start_turn (money, cooking, washing, expiry, switch back)
+    and then blue's actions before red's, same order as Game.run_game
+
+    returns (red results, blue results)
+    '''
+    if red_controller is None:
+        red_controller = RobotController(Team.RED, game_state, verbose=False)
+    if blue_controller is None:
+        blue_controller = RobotController(Team.BLUE, game_state, verbose=False)
+
+    game_state.start_turn()
+
+    blue_results = apply_actions(blue_controller, actions_blue)
+    blue_controller.advance_navigation()
+    red_results = apply_actions(red_controller, actions_red)
+    red_controller.advance_navigation()
+    return red_results, blue_results
+
+
+class ForwardModel:
+    '''A private game state with its controllers that can be stepped and cloned'''
+
+    def __init__(self, game_state: GameState):
+        self.game_state = game_state
+        self.red_controller = RobotController(Team.RED, game_state, verbose=False)
+        self.blue_controller = RobotController(Team.BLUE, game_state, verbose=False)
+
+    def get_controller(self, team: Team) -> RobotController:
+        '''controller for the team in this simulation, for reading the simulated state'''
+        return self.red_controller if team == Team.RED else self.blue_controller
+
+    def clone(self) -> ForwardModel:
+        return ForwardModel(self.game_state.clone())
+
+    def step(self, actions_red: Optional[Sequence[Action]] = None, actions_blue: Optional[Sequence[Action]] = None) -> Tuple[List[bool], List[bool]]:
+        '''advance one turn, see step()'''
+        return step(self.game_state, actions_red, actions_blue, self.red_controller, self.blue_controller)
+
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+
+def random_moves(game_state: GameState, team: Team, rng: random.Random) -> List[Action]:
+    '''every bot of the team tries a random step'''
+    return [
+        ("move", bot_id, rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        for bot_id, b in game_state.bots.items()
+        if b.team == team
+    ]
+
+
+def main():
+    '''measures clone + step throughput on a map'''
+    from map_processor import load_game_state
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--map", default="maps/map1.txt", help="path to map text file")
+    ap.add_argument("--iters", type=int, default=5000, help="number of clone + step pairs")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    game_state, _ = load_game_state(args.map)
+    root = ForwardModel(game_state)
+    rng = random.Random(args.seed)
+
+    t0 = time.perf_counter()
+    fm = root
+    for i in range(args.iters):
+        #restart from the root every 50 turns like a shallow search would
+        fm = (root if i % 50 == 0 else fm).clone()
+        fm.step(random_moves(fm.game_state, Team.RED, rng), random_moves(fm.game_state, Team.BLUE, rng))
+    dt = time.perf_counter() - t0
+
+    print(f"[BENCH] {args.map}: {args.iters} clone+step in {dt:.3f}s -> {args.iters / dt:.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
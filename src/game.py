@@ -7,21 +7,24 @@ import copy
 import importlib.util
 import json
 import os
+import random
+import signal
 import sys
+import threading
 import time
 import traceback
 from threading import Thread
 from typing import Optional, Any, Dict, List, Tuple
 
-from game_constants import Team, GameConstants
+from game_constants import Team, GameConstants, Rules
 from game_state import GameState
 from robot_controller import RobotController
 
-from map_processor import load_two_team_maps_and_orders
-from render import Renderer
+from map_processor import load_game_state, find_default_floor_spawn
 
 
-def import_file(module_name: str, file_path: str):
+def import_file(module_name: str, file_path: str, code: Any = None):
+    '''import a bot file as a new module; `code` is its compile_file() result to skip reading and compiling'''
     spec = importlib.util.spec_from_file_location(module_name, file_path)
     if spec is None or spec.loader is None:
         raise ImportError(f"Cannot import {file_path}")
@@ -29,26 +32,26 @@ def import_file(module_name: str, file_path: str):
 
     sys.modules[module_name] = module
 
-    spec.loader.exec_module(module)
+    if code is None:
+        spec.loader.exec_module(module)
+    else:
+        exec(code, module.__dict__)
     return module
 
 
+class TurnTimeout(BaseException):
+    '''raised inside a trusted bot's play_turn when its time is up (BaseException so `except Exception` lets it through)'''
+
+
+def raise_turn_timeout(signum, frame):
+    raise TurnTimeout()
+
+
+def compile_file(file_path: str) -> Any:
+    '''code object of a bot file for import_file()'''
+    with open(file_path, "r", encoding="utf-8") as f:
+        return compile(f.read(), file_path, "exec")
 
-def find_default_floor_spawn(m, prefer_center=True) -> Tuple[int, int]:
-    '''if map has no red, blue spawn markers, find the centermost walkable spawn'''
-    if prefer_center:
-        cx, cy = m.width // 2, m.height // 2
-        for r in range(min(m.width, m.height)):
-            for dx in range(-r, r + 1):
-                for dy in range(-r, r + 1):
-                    x, y = cx + dx, cy + dy
-                    if m.in_bounds(x, y) and getattr(m.tiles[x][y], "is_walkable", False):
-                        return (x, y)
-    for y in range(m.height):
-        for x in range(m.width):
-            if getattr(m.tiles[x][y], "is_walkable", False):
-                return (x, y)
-    return (0, 0)
 
 
 class Game:
@@ -59,12 +62,25 @@ class Game:
         map_path: str,
         replay_path: Optional[str] = None,
         render: bool = False,
-        turn_limit: int = GameConstants.TOTAL_TURNS,
+        turn_limit: Optional[int] = None,
         per_turn_timeout_s: float = 0.6,
         fps_cap: int = 30,
+        game_state: Optional[GameState] = None,
+        bot_code: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
+        rules: Optional[Rules] = None,
     ):
+        '''
+        game_state: already loaded map to play on instead of loading map_path (a copy is played on, it stays unchanged)
+        bot_code: compile_file() results by bot path, used instead of reading the bot files
+        trusted: for self-play of your own bots, the controllers hand out live references (see robot_controller.py),
+            play_turn runs without a timeout thread (the time limit still holds, see call_trusted) and no replay frames
+            are built unless they are written or rendered
+        rules: game_constants.Rules to play by instead of the map's own (ignored with game_state, which has its rules)
+        turn_limit: defaults to the rules' total_turns
+        '''
         self.render_enabled = render
-        self.turn_limit = turn_limit
+        self.trusted = trusted
         self.per_turn_timeout_s = per_turn_timeout_s
         self.fps_cap = fps_cap
 
@@ -72,73 +88,83 @@ class Game:
         if replay_path is not None:
             os.makedirs(os.path.dirname(replay_path) or ".", exist_ok=True)
 
-        #load the maps
-        map_red, map_blue, orders_red, orders_blue, parsed = load_two_team_maps_and_orders(map_path)
-
-        #create game state
-        self.game_state = GameState(red_map=map_red, blue_map=map_blue)
-
-
-        #get midgame switch window from map
-        self.game_state.switch_turn = getattr(parsed, "switch_turn", GameConstants.MIDGAME_SWITCH_TURN)
-        self.game_state.switch_duration = getattr(parsed, "switch_duration", GameConstants.MIDGAME_SWITCH_DURATION)
-
-
-        #load orders into the game state
-        self.game_state.orders[Team.RED] = orders_red
-        self.game_state.orders[Team.BLUE] = orders_blue
-
-        #make next_order_id to avoid collisions if spawn_order() is useed later
-        max_id = 0
-        for o in orders_red:
-            max_id = max(max_id, o.order_id)
-        self.game_state.next_order_id = max_id + 1
+        #load the maps, orders and bot spawns once; every match (see reset()) plays on a fresh copy of it
+        if game_state is None:
+            game_state, _ = load_game_state(map_path, rules=rules)
+        self.template = game_state
+        self.turn_limit = turn_limit if turn_limit is not None else game_state.rules.total_turns
+        self.game_state = game_state.clone()
+        self.bot_code = bot_code or {}
 
         #import bots, need the play turn mechanic
-        self.red_failed_init = False
-        self.blue_failed_init = False
-
-        #try to import
+        self.red_bot_path = red_bot_path
+        self.blue_bot_path = blue_bot_path
+        self.red_module = self.import_bot(Team.RED, red_bot_path)
+        self.blue_module = self.import_bot(Team.BLUE, blue_bot_path)
+        self.init_players()
+
+        #renderer if available (pygame is only imported when rendering)
+        self.renderer = None
+        if self.render_enabled:
+            from render import Renderer
+            self.renderer = Renderer(self.game_state)
+
+    def import_bot(self, team: Team, path: str) -> Any:
+        '''the bot file as a module, None if it cannot be imported'''
         try:
-            red_name = os.path.basename(red_bot_path).rsplit(".", 1)[0]
-            self.red_player = import_file(red_name, red_bot_path).BotPlayer(copy.deepcopy(self.game_state.red_map))
+            name = os.path.basename(path).rsplit(".", 1)[0]
+            return import_file(name, path, self.bot_code.get(path))
         except Exception as e:
-            self.red_failed_init = True
-            print(f"[INIT] Red bot failed: {e}")
+            print(f"[INIT] {team.name.capitalize()} bot failed: {e}")
             traceback.print_exc()
+            return None
 
-        try:
-            blue_name = os.path.basename(blue_bot_path).rsplit(".", 1)[0]
-            self.blue_player = import_file(blue_name, blue_bot_path).BotPlayer(copy.deepcopy(self.game_state.blue_map))
-        except Exception as e:
-            self.blue_failed_init = True
-            print(f"[INIT] Blue bot failed: {e}")
-            traceback.print_exc()
+    def init_players(self) -> None:
+        '''new BotPlayers (from the imported modules) and controllers for the current game state'''
+        self.red_failed_init = self.red_module is None
+        self.blue_failed_init = self.blue_module is None
 
-        #generate the controllers
-        self.red_controller = RobotController(Team.RED, self.game_state)
-        self.blue_controller = RobotController(Team.BLUE, self.game_state)
+        #try to init
+        if not self.red_failed_init:
+            try:
+                self.red_player = self.red_module.BotPlayer(copy.deepcopy(self.game_state.red_map))
+            except Exception as e:
+                self.red_failed_init = True
+                print(f"[INIT] Red bot failed: {e}")
+                traceback.print_exc()
 
-        #put the bots in the parsed map
-        if parsed.spawns_red:
-            for (x, y) in parsed.spawns_red:
-                self.game_state.add_bot(Team.RED, x, y)
-        else:
-            x, y = find_default_floor_spawn(self.game_state.red_map)
-            self.game_state.add_bot(Team.RED, x, y)
+        if not self.blue_failed_init:
+            try:
+                self.blue_player = self.blue_module.BotPlayer(copy.deepcopy(self.game_state.blue_map))
+            except Exception as e:
+                self.blue_failed_init = True
+                print(f"[INIT] Blue bot failed: {e}")
+                traceback.print_exc()
 
-        if parsed.spawns_blue:
-            for (x, y) in parsed.spawns_blue:
-                self.game_state.add_bot(Team.BLUE, x, y)
-        else:
-            x, y = find_default_floor_spawn(self.game_state.blue_map)
-            self.game_state.add_bot(Team.BLUE, x, y)
+        #generate the controllers
+        self.red_controller = RobotController(Team.RED, self.game_state, trusted=self.trusted)
+        self.blue_controller = RobotController(Team.BLUE, self.game_state, trusted=self.trusted)
 
         #replay
         self.replay: List[Dict[str, Any]] = []
 
-        #renderer if available
-        self.renderer = Renderer(self.game_state) if self.render_enabled else None
+    def reset(self, red_bot: Optional[str] = None, blue_bot: Optional[str] = None, seed: Optional[int] = None) -> None:
+        '''
+        set up the next match on the same map in place: the game state goes back to a fresh copy of the loaded map
+        (only the stations are copied, see GameState.clone), the bots get new BotPlayers of their already imported
+        modules (a different red_bot / blue_bot path is imported), seed seeds `random` for the bots
+        '''
+        if seed is not None:
+            random.seed(seed)
+        self.game_state.reset_to(self.template)
+
+        if red_bot is not None and red_bot != self.red_bot_path:
+            self.red_bot_path = red_bot
+            self.red_module = self.import_bot(Team.RED, red_bot)
+        if blue_bot is not None and blue_bot != self.blue_bot_path:
+            self.blue_bot_path = blue_bot
+            self.blue_module = self.import_bot(Team.BLUE, blue_bot)
+        self.init_players()
 
     def call_player(self, team: Team) -> bool:
         '''calls the player run code'''
@@ -153,6 +179,14 @@ class Game:
             player = self.blue_player
             controller = self.blue_controller
 
+        #sleeping bots (controller.sleep_until) are not called at all
+        if controller.is_asleep():
+            controller.advance_navigation()
+            return True
+
+        if self.trusted:
+            return self.call_trusted(team, player, controller)
+
         ok = True
         exc: Optional[BaseException] = None
 
@@ -178,8 +212,76 @@ class Game:
             print(f"[TURN REUNNER] {team.name} crashed: {exc}")
             traceback.print_exc()
             return False
+
+        #bots with a move_to() goal take their step
+        controller.advance_navigation()
+        return True
+
+    def call_trusted(self, team: Team, player: Any, controller: RobotController) -> bool:
+        '''
+        play_turn called directly, with the same time limit as the thread: the call is timed, and where there is a
+        SIGALRM (main thread on Unix) an alarm interrupts a bot that is still running when its time is up
+        '''
+        alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        timed_out = False
+        crash: Optional[BaseException] = None
+        t0 = time.perf_counter()
+        try:
+            if alarm:
+                old_handler = signal.signal(signal.SIGALRM, raise_turn_timeout)
+                signal.setitimer(signal.ITIMER_REAL, self.per_turn_timeout_s)
+            try:
+                player.play_turn(controller)
+            except TurnTimeout:
+                timed_out = True
+            except Exception as e:
+                crash = e
+            finally:
+                if alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                    signal.signal(signal.SIGALRM, old_handler)
+        except TurnTimeout:
+            #the alarm went off right after play_turn returned
+            timed_out = True
+        dt = time.perf_counter() - t0
+
+        if timed_out or dt > self.per_turn_timeout_s:
+            print(f"[TURN RUNNER] {team.name} timed out ({dt:.3f}s > {self.per_turn_timeout_s:.3f}s)")
+            return False
+        if crash is not None:
+            print(f"[TURN RUNNER] {team.name} crashed: {crash}")
+            traceback.print_exception(type(crash), crash, crash.__traceback__)
+            return False
+
+        controller.advance_navigation()
         return True
 
+    def fast_forward(self, game_states: List[Any]) -> None:
+        '''
+        when both teams sleep (controller.sleep_until) and no bot walks a move_to() goal, jump to the turn before
+        the next one where something happens (GameState.idle_horizon) in closed form; the skipped turns are
+        written to game_states as their count and turned into frames by expand_idle_frames() at the end
+        '''
+        wake = [self.red_controller.idle_until(), self.blue_controller.idle_until()]
+        if None in wake:
+            return
+        target = min([self.game_state.idle_horizon(), self.turn_limit] + wake) - 1
+        skip = target - self.game_state.turn
+        if skip <= 0:
+            return
+        self.game_state.advance_idle(skip)
+        game_states.append(skip)
+
+    def expand_idle_frames(self, game_states: List[Any]) -> List[Dict[str, Any]]:
+        '''replace the skipped turn counts written by fast_forward() with their frames'''
+        out: List[Dict[str, Any]] = []
+        for frame in game_states:
+            if isinstance(frame, int):
+                out.extend(GameState.idle_frames(out[-1], frame, self.game_state.rules.money_per_turn))
+            else:
+                out.append(frame)
+        return out
+
     def record_turn(self):
         self.replay.append(self.game_state.to_dict()) #for the replay rile
 
@@ -279,14 +381,16 @@ class Game:
             print("[GAME] Both bots failed to initialize.")
             return None
 
-        # Store all game states
+        # Store all game states (trusted games without a replay or rendering skip them)
         game_states = []
+        record = not self.trusted or self.replay_path is not None or self.render_enabled
         
         # Record initial state
-        game_states.append(self.game_state.to_dict())
+        if record:
+            game_states.append(self.game_state.to_dict())
 
         # Run the entire game first to generate all frames
-        for turn_idx in range(self.turn_limit):
+        while self.game_state.turn < self.turn_limit:
             #start turn (money + environment + expirations)
             self.game_state.start_turn()
 
@@ -295,7 +399,8 @@ class Game:
             red_ok = self.call_player(Team.RED)
 
             #record state
-            game_states.append(self.game_state.to_dict())
+            if record:
+                game_states.append(self.game_state.to_dict())
 
             #if one side crashes, then the other side wins by default
             if not blue_ok and red_ok:
@@ -310,6 +415,9 @@ class Game:
                 print("[GAME] Both failed, no winner")
                 winner = None
                 break
+
+            #skip the turns where nobody would do anything
+            self.fast_forward(game_states if record else [])
         else:
             # Game completed all turns
             red_money = self.game_state.get_team_money(Team.RED)
@@ -328,6 +436,7 @@ class Game:
                 winner = None
 
         # Store replay
+        game_states = self.expand_idle_frames(game_states)
         self.replay = game_states[1:]  # Skip initial state for replay
         self.export_replay(winner)
 
@@ -379,9 +488,10 @@ def main():
     ap.add_argument("--map", required=True, help="path to map text file (layout + optional ORDERS:)")
     ap.add_argument("--replay", default=None, help="optional output replay json path")
     ap.add_argument("--render", action="store_true", help="enable pygame rendering")
-    ap.add_argument("--turns", type=int, default=GameConstants.TOTAL_TURNS, help="turn limit")
+    ap.add_argument("--turns", type=int, default=None, help="turn limit (default: the map's rules)")
     ap.add_argument("--timeout", type=float, default=0.6, help="per-turn timeout seconds per bot")
     ap.add_argument("--fps", type=int, default=30, help="fps cap when rendering")
+    ap.add_argument("--trusted", action="store_true", help="self-play of your own bots: no safety copies or timeout thread (turn time limits still apply)")
     args = ap.parse_args()
 
     g = Game(
@@ -393,6 +503,7 @@ def main():
         turn_limit=args.turns,
         per_turn_timeout_s=args.timeout,
         fps_cap=args.fps,
+        trusted=args.trusted,
     )
     try:
         g.run_game()
@@ -1,5 +1,6 @@
 '''game_constants.py'''
 
+from dataclasses import dataclass, fields, replace
 from enum import Enum
 
 
@@ -63,6 +64,7 @@ class ShopCosts(Enum):
 class GameConstants:
   TOTAL_TURNS = 500 #this is default without engine specification
 
+  STARTING_MONEY = 150
   MONEY_PER_TURN = 1
 
   COOK_PROGRESS = 20
@@ -72,4 +74,27 @@ class GameConstants:
 
   #WARNING: this should be specified in the map, but if not, default are these:
   MIDGAME_SWITCH_TURN = 250
-  MIDGAME_SWITCH_DURATION = 100
\ No newline at end of file
+  MIDGAME_SWITCH_DURATION = 100
+
+
+@dataclass(frozen=True)
+class Rules:
+  '''
+  the numbers of one game, GameConstants by default; every GameState has its own (game_state.rules,
+  controller.get_rules()), a map file can change them with a header line like
+      RULES: cook_progress=15 burn_progress=30 starting_money=200
+  '''
+  total_turns: int = GameConstants.TOTAL_TURNS
+  starting_money: int = GameConstants.STARTING_MONEY
+  money_per_turn: int = GameConstants.MONEY_PER_TURN
+  cook_progress: int = GameConstants.COOK_PROGRESS
+  burn_progress: int = GameConstants.BURN_PROGRESS
+  plate_wash_progress: int = GameConstants.PLATE_WASH_PROGRESS
+
+  def override(self, **values: int) -> "Rules":
+    '''copy with some rules changed'''
+    names = {f.name for f in fields(self)}
+    for name in values:
+      if name not in names:
+        raise ValueError(f"unknown rule {name}, expected one of {sorted(names)}")
+    return replace(self, **values)
@@ -4,13 +4,15 @@ Game state that keeps track of teams, bots, maps, team money, bot items, and ord
 
 from __future__ import annotations
 
+import copy
+import hashlib
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 
-from game_constants import Team, TileType, FoodType, GameConstants
+from game_constants import Team, TileType, FoodType, GameConstants, Rules
 from map import Map
-from tiles import Tile, Floor, Wall, Counter, Sink, SinkTable, Cooker, Trash, Submit, Shop, Box
-from item import Item, Food, Plate, Pan
+from tiles import Tile, Floor, Wall, Counter, Sink, SinkTable, Cooker, Trash, Submit, Shop, Box, TurnClock
+from item import Item, Food, Plate, Pan, food_multiset
 
 
 # -----------------------
@@ -37,6 +39,11 @@ class Order:
     claimed_by: Optional[int] = None
     completed_turn: Optional[int] = None
     penalized: bool = False
+    signature: Optional[Tuple[Food, ...]] = None #required foods as a plate multiset, see order_signature()
+
+    def __post_init__(self):
+        if self.signature is None:
+            self.signature = order_signature(self.required)
 
     def is_expired(self, turn: int) -> bool:
         return turn > self.expires_turn
@@ -44,35 +51,67 @@ class Order:
     def is_active(self, turn: int) -> bool:
         return self.created_turn <= turn <= self.expires_turn and self.completed_turn is None
 
+    def is_settled(self) -> bool:
+        '''completed or penalized orders never change again'''
+        return self.completed_turn is not None or self.penalized
 
-def plate_food_signature(plate: Plate) -> List[Tuple[int, bool, int]]:
-    '''Helper that basically creates a unique signature for each user plated food'''
-
-    sig: List[Tuple[int, bool, int]] = [] #unique plate signature exists as a list of tuples
+    def copy(self) -> Order:
+        o = object.__new__(Order)
+        o.__dict__.update(self.__dict__)
+        return o
 
-    for f in plate.food:
-        if isinstance(f, Food):
-            sig.append((f.food_id, bool(getattr(f, "chopped", False)), int(getattr(f, "cooked_stage", 0))))
-        elif isinstance(f, FoodType):
-            sig.append((f.food_id, False, 0))
-        else:
-            sig.append((-1, False, 0))
 
-    sig.sort()
-    return sig
+def plate_food_signature(plate: Plate) -> Tuple[Food, ...]:
+    '''Helper that gives the unique signature of the user plated food (kept up to date by the plate itself)'''
+    return plate.contents
 
 
-def order_signature(req: List[FoodType]) -> List[Tuple[int, bool, int]]:
-    '''Helper that creates the order required plate signature'''
-    
-    sig = [(ft.food_id, ft.can_chop, 1 if ft.can_cook else 0) for ft in req] #basically force chopped and cooked if the food can
-    sig.sort()
-    return sig
+def order_signature(req: List[FoodType]) -> Tuple[Food, ...]:
+    '''Helper that creates the order required plate signature, a multiset like Plate.contents'''
+    #basically force chopped and cooked if the food can
+    return food_multiset(Food(ft, ft.can_chop, 1 if ft.can_cook else 0) for ft in req)
 
 
 def plate_matches_order(plate: Plate, order: Order) -> bool:
     '''Sees if the plate matches the order'''
-    return plate_food_signature(plate) == order_signature(order.required)
+    return plate.contents == order.signature
+
+
+# -----------------------
+# State hashing
+# -----------------------
+
+_zobrist_keys: Dict[Tuple, int] = {}
+
+def zobrist_key(feature: Tuple) -> int:
+    '''
+    random-looking 64 bit key of a (hashable, repr-stable) feature tuple, the same in every process
+    (python's own hash() of strings changes between runs)
+    '''
+    key = _zobrist_keys.get(feature)
+    if key is None:
+        key = int.from_bytes(hashlib.blake2b(repr(feature).encode(), digest_size=8).digest(), "little")
+        _zobrist_keys[feature] = key
+    return key
+
+
+# -----------------------
+# Change tracking
+# -----------------------
+
+@dataclass(eq=False)
+class ChangeSet:
+    '''what changed since the watcher last cleared it, see GameState.watch()'''
+    tiles: set
+    bots: set
+    orders: set
+    full: bool = True #everything may have changed (new watcher, rollback, from_dict)
+
+    def clear(self) -> None:
+        self.tiles.clear()
+        self.bots.clear()
+        self.orders.clear()
+        self.full = False
 
 
 # -----------------------
@@ -94,6 +133,11 @@ class BotState:
         '''Helper that gets their position'''
         return (self.x, self.y)
 
+    def copy(self) -> BotState:
+        '''copy with its own copy of the held item'''
+        holding = self.holding.copy() if self.holding is not None else None
+        return BotState(self.bot_id, self.team, self.x, self.y, holding, self.map_team)
+
 
 # -----------------------
 # Tile factory and map normalization
@@ -147,20 +191,24 @@ def normalize_map_tiles(m: Map) -> None:
 
 class GameState:
     '''Game state class that keeps track of the state at each turn'''
-    def __init__(self, red_map: Map, blue_map: Map):
+    def __init__(self, red_map: Map, blue_map: Map, rules: Optional[Rules] = None):
         self.red_map = red_map
         self.blue_map = blue_map
+        self.rules = rules if rules is not None else Rules() #immutable, shared by clones
 
+        self.clock = TurnClock() #backs self.turn, cookers read it
         self.turn = 0
         self.bots: Dict[int, BotState] = {}
         
         #shared team money
-        self.team_money: Dict[Team, int] = {Team.RED: 150, Team.BLUE: 150}
+        self.team_money: Dict[Team, int] = {Team.RED: self.rules.starting_money, Team.BLUE: self.rules.starting_money}
         
         #each team has its own independent order list
         self.orders: Dict[Team, List[Order]] = {Team.RED: [], Team.BLUE: []}
         
         self.next_order_id = 1
+        #submit_plate() lookup per team: (turn, number of orders, {signature: active order indices, earliest expiry first})
+        self.order_lookup: Dict[Team, Tuple[int, int, Dict[Tuple[Food, ...], List[int]]]] = {}
 
         #switching states
         self.switch_turn = GameConstants.MIDGAME_SWITCH_TURN
@@ -170,6 +218,12 @@ class GameState:
         #init map tiles
         normalize_map_tiles(self.red_map)
         normalize_map_tiles(self.blue_map)
+        self.bind_cookers()
+
+        #cook progress is derived from the turn, only the stage changes are scheduled: turn -> cookers due
+        self.cook_due: Dict[int, Optional[Tuple[Tuple[Team, int, int], ...]]] = {}
+        #sinks a bot washed this turn, the next tick washes them
+        self.washing: Tuple[Tuple[Team, int, int], ...] = ()
 
         #occ maps
         self.occupancy = {
@@ -177,9 +231,297 @@ class GameState:
             Team.BLUE: [[None for _ in range(self.blue_map.height)] for _ in range(self.blue_map.width)],
         }
 
+        #undo log: only kept while a checkpoint is open, see push_checkpoint()
+        #entries are (obj, attr or key, old value, is_key) or (touch_*, key, None, None) for the state hash
+        self.journal: Optional[List[Tuple[Any, Any, Any, Optional[bool]]]] = None
+        self.checkpoints: List[int] = []
+        self.rollbacks = 0 #controllers hand out fresh turn budgets after a rollback
+
+        #incremental state hash, None until the first state_hash() call
+        self.zobrist: Optional[int] = None
+        self.zobrist_start = 0 #journal length when hashing started
+        self.dirty_tiles: set = set()
+        self.dirty_bots: set = set()
+        self.dirty_orders: set = set()
+
+        #change sets of incremental readers (observation encoders), fed by the touch_* helpers
+        self.watchers: List[ChangeSet] = []
+
+        #event feed for the controllers, see emit(); events[0] is event number events_base
+        self.events: List[Dict[str, Any]] = []
+        self.events_base = 0
+
+        #move_to() goals: bot_id -> (map_team, x, y) or None, stepped by RobotController.advance_navigation()
+        self.nav_goals: Dict[int, Optional[Tuple[Team, int, int]]] = {}
+        self.navigator = None #navigation.Navigator with cached distance fields, shared by clones
+
+    @property
+    def turn(self) -> int:
+        return self.clock.turn
+
+    @turn.setter
+    def turn(self, value: int) -> None:
+        self.clock.turn = value
+
+    def bind_cookers(self) -> None:
+        '''point the cookers of both maps at this state's clock'''
+        for m in (self.red_map, self.blue_map):
+            for x, y in m.positions_of("COOKER"):
+                m.tiles[x][y].clock = self.clock
+
+    def clone(self) -> GameState:
+        '''
+        fast copy for simulating ahead (much cheaper than deepcopy):
+        static tiles are shared between the copies, stations, bots, orders and occupancy are copied
+        '''
+        new = copy.copy(self)
+
+        #inside a checkpoint the tiles and orders we own were changed in place, a rollback sets them back
+        #with setattr: the clone must not share them
+        in_checkpoint = self.journal is not None
+        new.red_map = self.red_map.clone(copy_owned=in_checkpoint)
+        new.blue_map = self.blue_map.clone(copy_owned=in_checkpoint)
+        new.clock = TurnClock(self.turn)
+        new.bind_cookers()
+        new.cook_due = {t: due for t, due in self.cook_due.items() if due and t > self.turn}
+
+        new.bots = {bot_id: b.copy() for bot_id, b in self.bots.items()}
+        new.team_money = dict(self.team_money)
+        new.orders = {
+            team: [o if o.is_settled() and not in_checkpoint else o.copy() for o in orders]
+            for team, orders in self.orders.items()
+        }
+        new.order_lookup = dict(self.order_lookup) #holds indices only, valid for the copied orders too
+        new.switched = dict(self.switched)
+        new.nav_goals = dict(self.nav_goals)
+        new.occupancy = {team: [col[:] for col in occ] for team, occ in self.occupancy.items()}
+
+        #a clone starts without any open checkpoints
+        new.journal = None
+        new.checkpoints = []
+        new.zobrist_start = 0
+
+        new.dirty_tiles = set(self.dirty_tiles)
+        new.dirty_bots = set(self.dirty_bots)
+        new.dirty_orders = set(self.dirty_orders)
+        new.watchers = []
+
+        #a clone only keeps the events that happen to it
+        new.events = []
+        new.events_base = self.events_base + len(self.events)
+        return new
+
+    def reset_to(self, template: GameState) -> None:
+        '''
+        turn this object into a fresh clone() of template (e.g. the state right after loading the map), for
+        starting the next game without new references to the state; controllers of the old game must be replaced
+        '''
+        self.__dict__.update(template.clone().__dict__)
+
+    # -------------
+    # Undo log
+    # -------------
+
+    def set_attr(self, obj: Any, name: str, value: Any) -> None:
+        '''every change of an attribute of the state (tiles, items, bots, orders) goes through here'''
+        if self.journal is not None:
+            self.journal.append((obj, name, getattr(obj, name), False))
+        setattr(obj, name, value)
+
+    def set_key(self, container: Any, key: Any, value: Any) -> None:
+        '''same as set_attr but for dict/list entries (money, occupancy, switched)'''
+        if self.journal is not None:
+            self.journal.append((container, key, container[key], True))
+        container[key] = value
+
+    def push_checkpoint(self) -> None:
+        '''start recording changes so the state can be rolled back to this point'''
+        if self.journal is None:
+            self.journal = []
+        self.checkpoints.append(len(self.journal))
+
+    def pop_checkpoint(self) -> None:
+        '''forget the latest checkpoint but keep its changes (they still belong to the checkpoint before it)'''
+        if not self.checkpoints:
+            raise GameStateException("pop_checkpoint() without a checkpoint")
+        self.checkpoints.pop()
+        if not self.checkpoints:
+            self.journal = None
+
+    def rollback(self) -> None:
+        '''undo every change since the latest checkpoint (and drop it) in O(changes)'''
+        if not self.checkpoints:
+            raise GameStateException("rollback() without a checkpoint")
+        mark = self.checkpoints.pop()
+        journal = self.journal
+
+        if self.zobrist is not None:
+            if self.zobrist_start > mark:
+                #hashing started inside the rolled back part, start over on the next state_hash()
+                self.zobrist = None
+            else:
+                #everything that is about to change back needs to be rehashed
+                for i in range(mark, len(journal)):
+                    touch, key, _, kind = journal[i]
+                    if kind is None:
+                        touch(*key)
+
+        while len(journal) > mark:
+            obj, name, old, is_key = journal.pop()
+            if is_key is None:
+                continue
+            if is_key:
+                obj[name] = old
+            else:
+                setattr(obj, name, old)
+
+        if not self.checkpoints:
+            self.journal = None
+        self.rollbacks += 1
+
+        #the journal does not say where the undone changes were
+        for w in self.watchers:
+            w.full = True
+
+    # -------------
+    # State hashing
+    # -------------
+
+    def state_hash(self) -> int:
+        '''
+        64 bit Zobrist-style hash of the full state (bots and holdings, tile items, cook/wash progress,
+        money, turn, switches and order status); only the parts that changed since the last call are rehashed
+        '''
+        if self.zobrist is None:
+            self.dirty_tiles.clear()
+            self.dirty_bots.clear()
+            self.dirty_orders.clear()
+            self.zobrist_start = len(self.journal) if self.journal is not None else 0
+
+            h = 0
+            for team in (Team.RED, Team.BLUE):
+                m = self.get_map(team)
+                for x in range(m.width):
+                    for y in range(m.height):
+                        h ^= self.tile_hash(team, x, y)
+                for i in range(len(self.orders[team])):
+                    h ^= self.order_hash(team, i)
+            for bot_id in self.bots:
+                h ^= self.bot_hash(bot_id)
+            self.zobrist = h
+
+        else:
+            h = self.zobrist
+            for key in self.dirty_tiles:
+                h ^= self.tile_hash(*key)
+            for key in self.dirty_bots:
+                h ^= self.bot_hash(key)
+            for key in self.dirty_orders:
+                h ^= self.order_hash(*key)
+            self.dirty_tiles.clear()
+            self.dirty_bots.clear()
+            self.dirty_orders.clear()
+            self.zobrist = h
+
+        #the few scalars are cheaper to hash on every call than to track
+        h ^= zobrist_key(("turn", self.turn))
+        for team in (Team.RED, Team.BLUE):
+            h ^= zobrist_key(("money", team.value, self.team_money.get(team, 0)))
+            h ^= zobrist_key(("switched", team.value, bool(self.switched.get(team, False))))
+        return h
+
+    def tile_hash(self, team: Team, x: int, y: int) -> int:
+        return zobrist_key(("tile", team.value, x, y, self.get_map(team).tiles[x][y].signature()))
+
+    def bot_hash(self, bot_id: int) -> int:
+        b = self.bots.get(bot_id)
+        if b is None:
+            return 0
+        holding = b.holding.signature() if b.holding is not None else None
+        return zobrist_key(("bot", bot_id, b.team.value, b.map_team.value, b.x, b.y, holding))
+
+    def order_hash(self, team: Team, index: int) -> int:
+        o = self.orders[team][index]
+        return zobrist_key(("order", team.value, index, o.order_id, o.claimed_by, o.completed_turn, o.penalized))
+
+    #the touch_* helpers are called BEFORE the thing changes: its old key is taken out of the hash now
+    #and the new one is put back in on the next state_hash(); watchers only get told where the change is
+
+    def touch_tile(self, team: Team, x: int, y: int) -> None:
+        for w in self.watchers:
+            w.tiles.add((team, x, y))
+        if self.zobrist is None:
+            return
+        if self.journal is not None:
+            #also when already dirty: a state_hash() inside the branch may clean it before a rollback
+            self.journal.append((self.touch_tile, (team, x, y), None, None))
+        if (team, x, y) in self.dirty_tiles:
+            return
+        self.zobrist ^= self.tile_hash(team, x, y)
+        self.dirty_tiles.add((team, x, y))
+
+    def touch_bot(self, bot_id: int) -> None:
+        for w in self.watchers:
+            w.bots.add(bot_id)
+        if self.zobrist is None:
+            return
+        if self.journal is not None:
+            #also when already dirty: a state_hash() inside the branch may clean it before a rollback
+            self.journal.append((self.touch_bot, (bot_id,), None, None))
+        if bot_id in self.dirty_bots:
+            return
+        self.zobrist ^= self.bot_hash(bot_id)
+        self.dirty_bots.add(bot_id)
+
+    def touch_order(self, team: Team, index: int) -> None:
+        for w in self.watchers:
+            w.orders.add((team, index))
+        if self.zobrist is None:
+            return
+        if self.journal is not None:
+            #also when already dirty: a state_hash() inside the branch may clean it before a rollback
+            self.journal.append((self.touch_order, (team, index), None, None))
+        if (team, index) in self.dirty_orders:
+            return
+        self.zobrist ^= self.order_hash(team, index)
+        self.dirty_orders.add((team, index))
+
+    def watch(self) -> ChangeSet:
+        '''register a change set that collects the tiles, bots and orders touched from now on'''
+        cs = ChangeSet(set(), set(), set())
+        self.watchers.append(cs)
+        return cs
+
+    def unwatch(self, cs: ChangeSet) -> None:
+        if cs in self.watchers:
+            self.watchers.remove(cs)
+
+    # -------------
+    # Events
+    # -------------
+
+    def emit(self, kind: str, team: Team, **data: Any) -> None:
+        '''record something that happened on team's map this turn (food cooked, order expired, ...)'''
+        n = len(self.events)
+        if self.journal is not None:
+            #a rollback cuts the event off again
+            self.journal.append((self.events, slice(n, n + 1), [], True))
+        self.events.append({"type": kind, "turn": self.turn, "team": team.name, **data})
+
+    def events_end(self) -> int:
+        '''number of the next event'''
+        return self.events_base + len(self.events)
+
+    def events_since(self, index: int) -> List[Dict[str, Any]]:
+        '''events numbered index and later'''
+        return self.events[max(0, index - self.events_base):]
+
     ####### Slider render
     def from_dict(self, data: dict):
         """Restore game state from dictionary"""
+        self.zobrist = None #rebuilt on the next state_hash()
+        for w in self.watchers:
+            w.full = True
         self.turn = data.get("turn", 0)
         
         # Restore money - fix: use team_money instead of money
@@ -230,27 +572,17 @@ class GameState:
                 if item_type == "Food":
                     food_type = get_food_type(holding_data["food_name"])
                     if food_type:
-                        food = Food(food_type)
-                        if "cooked" in holding_data:
-                            food.cooked_stage = holding_data["cooked"]
-                        if "chopped" in holding_data:
-                            food.chopped = holding_data["chopped"]
+                        food = Food(food_type, holding_data.get("chopped", False), holding_data.get("cooked", 0))
                         bot.holding = food
                     
                 elif item_type == "Plate":
-                    plate = Plate()
-                    plate.dirty = holding_data.get("dirty", False)
                     # Restore foods on plate
+                    foods = []
                     for food_data in holding_data.get("food", []):
                         food_type = get_food_type(food_data["food_name"])
                         if food_type:
-                            food = Food(food_type)
-                            if "cooked" in food_data:
-                                food.cooked_stage = food_data["cooked"]
-                            if "chopped" in food_data:
-                                food.chopped = food_data["chopped"]
-                            plate.food.append(food)
-                    bot.holding = plate
+                            foods.append(Food(food_type, food_data.get("chopped", False), food_data.get("cooked", 0)))
+                    bot.holding = Plate(foods, holding_data.get("dirty", False))
                     
                 elif item_type == "Pan":
                     pan = Pan()
@@ -258,11 +590,7 @@ class GameState:
                         food_data = holding_data["food"]
                         food_type = get_food_type(food_data["food_name"])
                         if food_type:
-                            food = Food(food_type)
-                            if "cooked" in food_data:
-                                food.cooked_stage = food_data["cooked"]
-                            if "chopped" in food_data:
-                                food.chopped = food_data["chopped"]
+                            food = Food(food_type, food_data.get("chopped", False), food_data.get("cooked", 0))
                             pan.food = food
                     bot.holding = pan
             
@@ -290,6 +618,20 @@ class GameState:
             raise GameStateException(f"out of bounds error: ({x},{y}) for team {team.name}")
         return m.tiles[x][y]
 
+    def get_tile_for_write(self, team: Team, x: int, y: int) -> Tile:
+        '''get the tile that is about to be changed, copying it first if it is shared with a clone'''
+        m = self.get_map(team)
+        if not m.in_bounds(x, y):
+            raise GameStateException(f"out of bounds error: ({x},{y}) for team {team.name}")
+        self.touch_tile(team, x, y)
+
+        old = m.tiles[x][y]
+        t = m.tile_for_write(x, y)
+        if t is not old and self.journal is not None:
+            #a rollback puts the shared tile back
+            self.journal.append((m.tiles[x], y, old, True))
+        return t
+
     def is_walkable(self, team: Team, x: int, y: int) -> bool:
         '''helper for movement'''
         t = self.get_tile(team, x, y)
@@ -303,7 +645,7 @@ class GameState:
         return self.team_money.get(team, 0)
 
     def add_team_money(self, team: Team, delta: int) -> None:
-        self.team_money[team] = self.team_money.get(team, 0) + delta
+        self.set_key(self.team_money, team, self.team_money.get(team, 0) + delta)
 
     # -------------
     # Bot creation
@@ -321,6 +663,7 @@ class GameState:
         #just make a new bot with new id (just error)
         if bot_id is None:
             bot_id = 0 if len(self.bots) == 0 else (max(self.bots.keys()) + 1)
+        self.touch_bot(bot_id)
 
         #start off at the beginning with current map team
         self.bots[bot_id] = BotState(bot_id=bot_id, team=team, x=x, y=y, holding=None, map_team=team)
@@ -339,11 +682,11 @@ class GameState:
 
     def start_turn(self) -> None:
         '''Run this at the start of each turn for environmental and passive'''
-        self.turn += 1
+        self.set_attr(self, "turn", self.turn + 1)
         
         #passive money
-        self.add_team_money(Team.RED, GameConstants.MONEY_PER_TURN)
-        self.add_team_money(Team.BLUE, GameConstants.MONEY_PER_TURN)
+        self.add_team_money(Team.RED, self.rules.money_per_turn)
+        self.add_team_money(Team.BLUE, self.rules.money_per_turn)
 
         #add envirnomental ticks (ie cooks) that do not require player action
         self.tick_environment(Team.RED)
@@ -352,11 +695,59 @@ class GameState:
         #order logic
         self.expire_orders()
 
+        if self.turn == self.switch_turn:
+            self.emit("switch_window_opened", Team.RED)
+            self.emit("switch_window_opened", Team.BLUE)
+
         #switch back when the time period ends
         if self.switch_window_ended(): #do this everytime in case of error
             self.return_team_home_if_switched(Team.RED)
             self.return_team_home_if_switched(Team.BLUE)
 
+    def idle_horizon(self) -> int:
+        '''
+        the next turn at which start_turn() does more than pay money and raise cook progress, assuming no bot acts:
+        a food gets cooked or burnt, a sink is washing, an order is created or expires, the switch window opens or ends
+        '''
+        t = self.turn
+        turns = [t + 1] if t == 0 or self.washing else [] #orders of turn 0 are announced on turn 1
+        turns.extend(due for due, keys in self.cook_due.items() if keys and due > t)
+
+        for team in (Team.RED, Team.BLUE):
+            for o in self.orders.get(team, []):
+                if o.created_turn > t:
+                    turns.append(o.created_turn)
+                if o.completed_turn is None and not o.penalized:
+                    turns.append(max(t + 1, o.expires_turn + 1))
+
+        for boundary in (self.switch_turn, self.switch_turn + self.switch_duration):
+            if boundary > t:
+                turns.append(boundary)
+        return min(turns, default=t + 10 ** 9)
+
+    def advance_idle(self, turns: int) -> None:
+        '''
+        the same as `turns` calls of start_turn() with no bot acting in between;
+        only valid while self.turn + turns < idle_horizon()
+        '''
+        if turns <= 0:
+            return
+        self.set_attr(self, "turn", self.turn + turns)
+        self.add_team_money(Team.RED, self.rules.money_per_turn * turns)
+        self.add_team_money(Team.BLUE, self.rules.money_per_turn * turns)
+        #cook progress follows the turn by itself
+
+    @staticmethod
+    def idle_frames(frame: Dict[str, Any], turns: int, money_per_turn: int = GameConstants.MONEY_PER_TURN) -> List[Dict[str, Any]]:
+        '''replay frames (to_dict()) of the turns skipped by advance_idle() after the frame'''
+        out = []
+        for i in range(1, turns + 1):
+            f = dict(frame)
+            f["turn"] = frame["turn"] + i
+            f["money"] = {team: money + money_per_turn * i for team, money in frame["money"].items()}
+            out.append(f)
+        return out
+
     def add_clean_plate_to_sinktable_near(self, team: Team, x: int, y: int) -> None:
         '''helper to put already washed dishes in the sink table automatically'''
         m = self.get_map(team)
@@ -368,7 +759,8 @@ class GameState:
                 continue
             t = m.tiles[nx][ny]
             if isinstance(t, SinkTable):
-                t.num_clean_plates += 1
+                self.touch_tile(team, nx, ny)
+                self.set_attr(t, "num_clean_plates", t.num_clean_plates + 1)
                 return
 
         #if there is no sink table near us in the common cas , we put the clean plates in the first sink table we see location
@@ -376,52 +768,137 @@ class GameState:
             for iy in range(m.height):
                 t = m.tiles[ix][iy]
                 if isinstance(t, SinkTable):
-                    t.num_clean_plates += 1
+                    self.touch_tile(team, ix, iy)
+                    self.set_attr(t, "num_clean_plates", t.num_clean_plates + 1)
                     return
 
     def tick_environment(self, team: Team) -> None:
-        '''cooking ticks helper that basically cooks if pan is in the food or wash if the dishes are washing'''
-        m = self.get_map(team)
-
-        for x in range(m.width):
-            for y in range(m.height):
-
-                #get the tile
-                tile = m.tiles[x][y]
-
-                #if the tile is a cooker, then we auto cook it through ticking
-                if isinstance(tile, Cooker):
-                    pan = tile.item
-                    if isinstance(pan, Pan) and isinstance(pan.food, Food):
-                        tile.cook_progress += 1
-                        if tile.cook_progress == GameConstants.COOK_PROGRESS and pan.food.cooked_stage == 0:
-                            pan.food.cooked_stage = 1
-                        elif tile.cook_progress >= GameConstants.BURN_PROGRESS:
-                            pan.food.cooked_stage = 2
-
-                #if the tile is a sink, then if we are washing, then we clean it
-                if isinstance(tile, Sink):
-
-                    if tile.using and tile.num_dirty_plates > 0:
-                        tile.curr_dirty_plate_progress += 1
+        '''
+        cooks and washes for one turn: cook progress is derived from the turn (Cooker.cook_start), so only the
+        cookers with a stage change due now and the sinks washed last turn are visited
+        '''
+        for key in self.cook_due.get(self.turn) or ():
+            if key[0] == team:
+                self.update_cooker(*key)
 
-                        if tile.curr_dirty_plate_progress >= GameConstants.PLATE_WASH_PROGRESS:
-                            tile.curr_dirty_plate_progress = 0
-                            tile.num_dirty_plates -= 1
-                            self.add_clean_plate_to_sinktable_near(team, x, y)
+        washing = [key for key in self.washing if key[0] == team]
+        if not washing:
+            return
+        self.set_attr(self, "washing", tuple(key for key in self.washing if key[0] != team))
 
-                    # reset the tile each turn so the user needs ot keep washing
-                    tile.using = False
+        m = self.get_map(team)
+        for _, x, y in washing:
+            tile = m.tiles[x][y]
+            if not isinstance(tile, Sink) or not tile.using:
+                continue
+            self.touch_tile(team, x, y)
+
+            if tile.num_dirty_plates > 0:
+                self.set_attr(tile, "curr_dirty_plate_progress", tile.curr_dirty_plate_progress + 1)
+
+                if tile.curr_dirty_plate_progress >= self.rules.plate_wash_progress:
+                    self.set_attr(tile, "curr_dirty_plate_progress", 0)
+                    self.set_attr(tile, "num_dirty_plates", tile.num_dirty_plates - 1)
+                    self.add_clean_plate_to_sinktable_near(team, x, y)
+                    self.emit("plate_washed", team, x=x, y=y)
+
+            # reset the tile each turn so the user needs ot keep washing
+            self.set_attr(tile, "using", False)
+
+    def start_cooking(self, team: Team, x: int, y: int, progress: int) -> None:
+        '''the food in the pan of the cooker at (x, y) cooks on from `progress`'''
+        tile = self.get_map(team).tiles[x][y]
+        self.set_attr(tile, "cook_start", self.turn - progress)
+        self.schedule_cooker(team, x, y)
+
+    def stop_cooking(self, team: Team, x: int, y: int) -> None:
+        self.set_attr(self.get_map(team).tiles[x][y], "cook_start", None)
+
+    def schedule_cooker(self, team: Team, x: int, y: int) -> None:
+        '''put the cooker's next stage change (cooked, then burnt) on cook_due'''
+        tile = self.get_map(team).tiles[x][y]
+        pan = tile.item
+        if tile.cook_start is None or not isinstance(pan, Pan) or not isinstance(pan.food, Food):
+            return
+        if pan.food.cooked_stage == 0 and tile.cook_progress < self.rules.cook_progress:
+            due = tile.cook_start + self.rules.cook_progress
+        elif pan.food.cooked_stage != 2:
+            due = max(self.turn + 1, tile.cook_start + self.rules.burn_progress)
+        else:
+            return
+        #entries of turns that already passed are kept, a rollback may need them again
+        self.cook_due.setdefault(due, None) #set_key journals the old value, a rollback puts None back
+        self.set_key(self.cook_due, due, (self.cook_due[due] or ()) + ((team, x, y),))
+
+    def update_cooker(self, team: Team, x: int, y: int) -> None:
+        '''apply a stage change that is due now (entries for food that was taken out meanwhile are ignored)'''
+        tile = self.get_map(team).tiles[x][y]
+        pan = getattr(tile, "item", None)
+        if not isinstance(tile, Cooker) or tile.cook_start is None or not isinstance(pan, Pan) or not isinstance(pan.food, Food):
+            return
+        food = pan.food
+        if tile.cook_progress == self.rules.cook_progress and food.cooked_stage == 0:
+            self.touch_tile(team, x, y)
+            self.set_attr(pan, "food", food.with_stage(1))
+            self.emit("food_cooked", team, x=x, y=y, food_name=food.food_name)
+            self.schedule_cooker(team, x, y)
+        elif tile.cook_progress >= self.rules.burn_progress and food.cooked_stage != 2:
+            self.touch_tile(team, x, y)
+            self.set_attr(pan, "food", food.with_stage(2))
+            self.emit("food_burnt", team, x=x, y=y, food_name=food.food_name)
+
+    def start_washing(self, team: Team, x: int, y: int) -> None:
+        '''a bot washes the sink at (x, y) this turn, the next tick makes progress'''
+        tile = self.get_map(team).tiles[x][y]
+        if not tile.using:
+            self.set_attr(self, "washing", self.washing + ((team, x, y),))
+        self.set_attr(tile, "using", True)
+
+    def cooker_timings(self, team: Team) -> List[Dict[str, Any]]:
+        '''
+        every cooker on team's map with the turns until its food is cooked and burnt, counted in start_turn() ticks
+        (0 = already); both are None for an empty pan
+        '''
+        m = self.get_map(team)
+        out: List[Dict[str, Any]] = []
+        for x, y in m.positions_of("COOKER"):
+            tile = m.tiles[x][y]
+            pan = getattr(tile, "item", None)
+            food = pan.food if isinstance(pan, Pan) else None
+            entry: Dict[str, Any] = {
+                "x": x,
+                "y": y,
+                "has_pan": isinstance(pan, Pan),
+                "food_name": None,
+                "cooked_stage": None,
+                "cook_progress": tile.cook_progress,
+                "turns_until_cooked": None,
+                "turns_until_burnt": None,
+            }
+            if isinstance(food, Food):
+                entry["food_name"] = food.food_name
+                entry["cooked_stage"] = food.cooked_stage
+                #mirrors tick_environment: cooked when the progress reaches COOK_PROGRESS, burnt at BURN_PROGRESS
+                entry["turns_until_cooked"] = 0 if food.cooked_stage >= 1 else max(0, self.rules.cook_progress - tile.cook_progress)
+                entry["turns_until_burnt"] = 0 if food.cooked_stage >= 2 else max(0, self.rules.burn_progress - tile.cook_progress)
+            out.append(entry)
+        return out
 
     def expire_orders(self) -> None:
         '''If an order expires without being completed then penalize that TEAM'''
         for team in [Team.RED, Team.BLUE]:
             
-            for o in self.orders.get(team, []):
+            for i, o in enumerate(self.orders.get(team, [])):
+                #orders of turn 0 are announced on the first turn
+                if o.created_turn == self.turn or (self.turn == 1 and o.created_turn < 1):
+                    self.emit("order_activated", team, order_id=o.order_id)
+
                 if o.completed_turn is None and o.is_expired(self.turn):
                     if not o.penalized:
+                        self.touch_order(team, i)
                         self.add_team_money(team, -o.penalty)
-                        o.penalized = True
+                        self.set_attr(o, "penalized", True)
+                        self.emit("order_expired", team, order_id=o.order_id, penalty=o.penalty)
 
 
     # -------------
@@ -465,7 +942,8 @@ class GameState:
                 continue
             t = m.tiles[nx][ny]
             if isinstance(t, Sink):
-                t.num_dirty_plates += 1
+                self.touch_tile(team, nx, ny)
+                self.set_attr(t, "num_dirty_plates", t.num_dirty_plates + 1)
                 return
 
         # the first sink anywhere
@@ -473,9 +951,29 @@ class GameState:
             for iy in range(m.height):
                 t = m.tiles[ix][iy]
                 if isinstance(t, Sink):
-                    t.num_dirty_plates += 1
+                    self.touch_tile(team, ix, iy)
+                    self.set_attr(t, "num_dirty_plates", t.num_dirty_plates + 1)
                     return
 
+    def find_order(self, team: Team, plate: Plate) -> Optional[int]:
+        '''index of the team's active order that the plate fills (the one expiring first), None if there is none'''
+        orders = self.orders.get(team, [])
+        cached = self.order_lookup.get(team)
+        if cached is None or cached[0] != self.turn or cached[1] != len(orders):
+            by_sig: Dict[Tuple[Food, ...], List[int]] = {}
+            for i, o in enumerate(orders):
+                if o.created_turn <= self.turn <= o.expires_turn:
+                    by_sig.setdefault(o.signature, []).append(i)
+            for found in by_sig.values():
+                found.sort(key=lambda i: orders[i].expires_turn)
+            cached = (self.turn, len(orders), by_sig)
+            self.order_lookup[team] = cached
+        #completed orders stay listed for the rest of the turn (a rollback may reopen them)
+        for i in cached[2].get(plate.contents, ()):
+            if orders[i].completed_turn is None:
+                return i
+        return None
+
     def submit_plate(self, bot_id: int, target_x: int, target_y: int) -> bool:
         '''logic to submit the plate, will go to MAP team not the team that submitted'''
 
@@ -488,21 +986,25 @@ class GameState:
             return False
 
         order_team = bot.map_team #MAP OWNER, not the submission team
-        for o in self.orders.get(order_team, []):
-            if o.is_active(self.turn) and plate_matches_order(bot.holding, o):
-                o.claimed_by = bot_id
-                o.completed_turn = self.turn
+        i = self.find_order(order_team, bot.holding)
+        if i is None:
+            return False
 
-                #reward map owner
-                self.add_team_money(order_team, o.reward)
+        o = self.orders[order_team][i]
+        self.touch_order(order_team, i)
+        self.touch_bot(bot_id)
+        self.set_attr(o, "claimed_by", bot_id)
+        self.set_attr(o, "completed_turn", self.turn)
 
-                #dirty plate goes into sink on that map specifically
-                self.add_dirty_plate_to_sink_near(order_team, target_x, target_y)
+        #reward map owner
+        self.add_team_money(order_team, o.reward)
 
-                bot.holding = None #lets go of jitem
-                return True
+        #dirty plate goes into sink on that map specifically
+        self.add_dirty_plate_to_sink_near(order_team, target_x, target_y)
+        self.emit("order_completed", order_team, order_id=o.order_id, reward=o.reward, bot_id=bot_id, by_team=bot.team.name)
 
-        return False
+        self.set_attr(bot, "holding", None) #lets go of jitem
+        return True
 
 
     # -----------------------
@@ -523,10 +1025,12 @@ class GameState:
         if self.occupancy[bot.map_team][new_x][new_y] is not None:
             return False
 
-        self.occupancy[bot.map_team][bot.x][bot.y] = None
-        self.occupancy[bot.map_team][new_x][new_y] = bot_id
+        self.touch_bot(bot_id)
+        self.set_key(self.occupancy[bot.map_team][bot.x], bot.y, None)
+        self.set_key(self.occupancy[bot.map_team][new_x], new_y, bot_id)
 
-        bot.x, bot.y = new_x, new_y
+        self.set_attr(bot, "x", new_x)
+        self.set_attr(bot, "y", new_y)
         return True
 
     
@@ -615,18 +1119,21 @@ class GameState:
         bot_ids = [bid for bid, b in self.bots.items() if b.team == team]
         for bid in bot_ids:
             b = self.bots[bid]
-            self.occupancy[b.map_team][b.x][b.y] = None
+            self.touch_bot(bid)
+            self.set_key(self.occupancy[b.map_team][b.x], b.y, None)
 
         #place on destination map with no  collisions between ANY bots
         for bid in bot_ids:
             b = self.bots[bid]
             spawn_x, spawn_y = self.find_free_spawn_near(dest_map, b.x, b.y)
-            b.map_team = dest_map
-            b.x, b.y = spawn_x, spawn_y
-            self.occupancy[dest_map][spawn_x][spawn_y] = bid
+            self.set_attr(b, "map_team", dest_map)
+            self.set_attr(b, "x", spawn_x)
+            self.set_attr(b, "y", spawn_y)
+            self.set_key(self.occupancy[dest_map][spawn_x], spawn_y, bid)
 
         #set state
-        self.switched[team] = True
+        self.set_key(self.switched, team, True)
+        self.emit("team_switched", dest_map, switched_team=team.name)
         return True
 
     def return_team_home_if_switched(self, team: Team) -> None:
@@ -640,17 +1147,20 @@ class GameState:
         #clear current occupancy
         for bid in bot_ids:
             b = self.bots[bid]
-            self.occupancy[b.map_team][b.x][b.y] = None
+            self.touch_bot(bid)
+            self.set_key(self.occupancy[b.map_team][b.x], b.y, None)
 
         #respawn on home map
         for bid in bot_ids:
             b = self.bots[bid]
             spawn_x, spawn_y = self.find_free_spawn_near(team, b.x, b.y)
-            b.map_team = team
-            b.x, b.y = spawn_x, spawn_y
-            self.occupancy[team][spawn_x][spawn_y] = bid
+            self.set_attr(b, "map_team", team)
+            self.set_attr(b, "x", spawn_x)
+            self.set_attr(b, "y", spawn_y)
+            self.set_key(self.occupancy[team][spawn_x], spawn_y, bid)
 
-        self.switched[team] = False
+        self.set_key(self.switched, team, False)
+        self.emit("team_returned", team, switched_team=team.name)
 
 
     # -----------------------
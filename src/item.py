@@ -1,8 +1,9 @@
 '''item.py File that provides Enums for Food and Food Container Item classes.'''
 
+import bisect
 from abc import ABC
 from enum import Enum, auto
-from typing import List, Optional, Any
+from typing import Any, Dict, List, Optional, Tuple
 from game_constants import FoodType
 
 class Item(ABC):
@@ -14,17 +15,62 @@ class Item(ABC):
         '''dictionary serialization for purposes of JSON'''
         return {"type": type(self).__name__}
 
+    def copy(self) -> "Item":
+        '''cheap copy (no deepcopy) used when cloning the game state'''
+        return type(self)()
+
+    def signature(self) -> Tuple:
+        '''hashable summary of the item's full state (used for state hashing)'''
+        return (type(self).__name__,)
+
 
 class Food(Item):
-    def __init__(self, food_type: FoodType):
-        self.food_name = food_type.food_name
-        self.food_id = food_type.food_id
-        self.can_chop = food_type.can_chop
-        self.can_cook = food_type.can_cook
-        self.buy_cost = food_type.buy_cost
+    '''
+    immutable and interned: there is exactly one Food per (food type, chopped, cooked_stage), so Food(...)
+    never allocates after the first time and two foods are the same food iff `a is b`;
+    chop()/with_stage() return the successor instead of changing the food
+    '''
+    _interned: Dict[Tuple[FoodType, bool, int], "Food"] = {}
+
+    def __new__(cls, food_type: FoodType, chopped: bool = False, cooked_stage: int = 0):
+        key = (food_type, bool(chopped), int(cooked_stage))
+        f = Food._interned.get(key)
+        if f is None:
+            f = object.__new__(cls)
+            put = object.__setattr__
+            put(f, "food_type", food_type)
+            put(f, "food_name", food_type.food_name)
+            put(f, "food_id", food_type.food_id)
+            put(f, "can_chop", food_type.can_chop)
+            put(f, "can_cook", food_type.can_cook)
+            put(f, "buy_cost", food_type.buy_cost)
+            put(f, "chopped", key[1])
+            put(f, "cooked_stage", key[2]) #0 is raw, 1 is cooked, 2 is burnt
+            put(f, "sig", ("Food", food_type.food_id, key[1], key[2]))
+            Food._interned[key] = f
+        return f
+
+    def __init__(self, food_type: FoodType, chopped: bool = False, cooked_stage: int = 0):
+        pass #set up once in __new__
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Food is immutable, replace it with food.chop() / food.with_stage() instead of setting {name}")
+
+    def __reduce__(self):
+        #unpickling interns again
+        return (Food, (self.food_type, self.chopped, self.cooked_stage))
 
-        self.chopped = False
-        self.cooked_stage = 0 #0 is raw, 1 is cooked, 2 is burnt
+    def __copy__(self) -> "Food":
+        return self
+
+    def __deepcopy__(self, memo) -> "Food":
+        return self
+
+    def chop(self) -> "Food":
+        return Food(self.food_type, True, self.cooked_stage)
+
+    def with_stage(self, cooked_stage: int) -> "Food":
+        return Food(self.food_type, self.chopped, cooked_stage)
 
     def to_dict(self):
         return {
@@ -35,10 +81,32 @@ class Food(Item):
             "cooked_stage": self.cooked_stage,
         }
 
+    def copy(self) -> "Food":
+        return self
+
+    def signature(self) -> Tuple:
+        return self.sig
+
+def food_multiset(foods) -> Tuple[Food, ...]:
+    '''canonical (sorted) hashable multiset of interned foods, equal for the same foods in any order'''
+    return tuple(sorted(foods, key=food_order))
+
+
+def food_order(f: Food) -> Tuple:
+    return f.sig
+
+
 class Plate(Item):
     def __init__(self, food: List[Item] = [], dirty: bool = False):
         self.food = food if food is not None else [] #what food is on the plate, can have multiple foods on the plate
         self.dirty = dirty #if the plate is dirty, no food should be on it
+        self.contents = food_multiset(self.food) #the foods as a multiset, compared with Order.signature
+
+    def contents_with(self, food: Food) -> Tuple[Food, ...]:
+        '''contents after adding the food (set it together with food)'''
+        c = list(self.contents)
+        bisect.insort(c, food, key=food_order)
+        return tuple(c)
 
     def to_dict(self):
         return {
@@ -48,6 +116,17 @@ class Plate(Item):
             "food": [f.to_dict() for f in self.food], 
         }
 
+    def copy(self) -> "Plate":
+        #foods are immutable, only the list is copied
+        p = object.__new__(Plate)
+        p.food = list(self.food)
+        p.dirty = self.dirty
+        p.contents = self.contents
+        return p
+
+    def signature(self) -> Tuple:
+        return ("Plate", self.dirty, tuple(f.signature() for f in self.food))
+
 class Pan(Item):
     def __init__(self, food: Optional[Food] = None):
         self.food = food #what food is on the pan, only 1 food at at a time on the pan
@@ -56,4 +135,10 @@ class Pan(Item):
         return {
             "type": "Pan",
             "food": self.food.to_dict() if self.food else None
-        }
\ No newline at end of file
+        }
+
+    def copy(self) -> "Pan":
+        return Pan(self.food)
+
+    def signature(self) -> Tuple:
+        return ("Pan", self.food.signature() if self.food else None)
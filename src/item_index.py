@@ -0,0 +1,153 @@
+# item_index.py
+"""
+Where the items and free stations are on each map, without scanning every tile.
+
+    controller.find_items(team, "MEAT", near=(bx, by))          #any meat, nearest first
+    controller.find_items(team, ("MEAT", False, 1))             #cooked meat
+    controller.find_items(team, "PLATE")                        #clean plates ("DIRTY_PLATE", "PAN")
+    controller.find_stations(team, "EMPTY_COUNTER", near=(bx, by), k=2)   #2 closest by walking
+
+Kinds of a tile:
+    food lying on it, in a pan on it or in a box: food_name and (food_name, chopped, cooked_stage)
+    a plate: "PLATE" or "DIRTY_PLATE" (the foods on a plate are not listed separately)
+    a pan: "PAN"
+
+Stations:
+    "EMPTY_COUNTER"                    counters without an item
+    "EMPTY_BOX", "BOX"                 boxes without / with items
+    ("BOX", kind)                      boxes holding the kind, e.g. ("BOX", "PLATE")
+    "CLEAN_PLATES"                     sink tables with clean plates
+
+The index watches its GameState (GameState.watch()); every place, pickup, chop, cook tick, trash, ...
+touches the tile, and touched tiles are re-indexed on the next query, so a query costs
+O(tiles changed since the last one + matches) instead of O(width * height).
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from game_constants import Team
+from game_state import GameState
+from item import Item, Food, Plate, Pan
+from recipe_dag import StationDistances, UNREACHABLE
+
+Kind = Union[str, Tuple[str, bool, int]]
+Station = Union[str, Tuple[str, Kind]]
+
+
+def item_kinds(it: Optional[Item]) -> List[Kind]:
+    if it is None:
+        return []
+    if isinstance(it, Food):
+        return [it.food_name, (it.food_name, bool(it.chopped), int(it.cooked_stage))]
+    if isinstance(it, Plate):
+        return ["DIRTY_PLATE" if it.dirty else "PLATE"]
+    if isinstance(it, Pan):
+        return ["PAN"] + item_kinds(it.food)
+    return [type(it).__name__.upper()]
+
+
+def station_kinds(tile) -> List[Station]:
+    name = tile.tile_name
+    if name == "COUNTER":
+        return ["EMPTY_COUNTER"] if tile.item is None else []
+    if name == "BOX":
+        if tile.count <= 0 or tile.item is None:
+            return ["EMPTY_BOX"]
+        return ["BOX"] + [("BOX", kind) for kind in item_kinds(tile.item)]
+    if name == "SINKTABLE":
+        return ["CLEAN_PLATES"] if tile.num_clean_plates > 0 else []
+    return []
+
+
+class ItemIndex:
+    '''kind -> positions of items and stations on both maps of a GameState, see the module docstring'''
+
+    def __init__(self, game_state: GameState):
+        self.game_state = game_state
+        self.changes = game_state.watch()
+        self.positions: Dict[Team, Dict[Kind, Set[Tuple[int, int]]]] = {}
+        self.kinds: Dict[Tuple[Team, int, int], List[Kind]] = {} #what each tile is listed under
+        self.stations: Dict[Team, Dict[Station, Set[Tuple[int, int]]]] = {}
+        self.station_of: Dict[Tuple[Team, int, int], List[Station]] = {}
+        self.distances: Dict[Team, StationDistances] = {} #walking distances, the layout never changes
+
+    def close(self) -> None:
+        '''stop tracking changes of the game state'''
+        self.game_state.unwatch(self.changes)
+
+    def find(self, team: Team, kind: Kind, near: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        '''positions holding the kind, nearest (Chebyshev) to `near` first, else in x then y order'''
+        self.refresh()
+        found = self.positions.get(team, {}).get(kind)
+        if not found:
+            return []
+        if near is None:
+            return sorted(found)
+        nx, ny = near
+        return sorted(found, key=lambda p: (max(abs(p[0] - nx), abs(p[1] - ny)), p))
+
+    def find_stations(self, team: Team, what: Station, near: Optional[Tuple[int, int]] = None, k: Optional[int] = None) -> List[Tuple[int, int]]:
+        '''
+        up to k stations in that state, closest by walking from `near` first (unreachable ones are left out),
+        else in x then y order
+        '''
+        self.refresh()
+        found = self.stations.get(team, {}).get(what)
+        if not found:
+            return []
+        if near is None:
+            out = sorted(found)
+            return out if k is None else out[:k]
+
+        dist = self.distances.get(team)
+        if dist is None:
+            dist = StationDistances(self.game_state.get_map(team))
+            self.distances[team] = dist
+        nx, ny = near
+        ranked = ((dist.walk(nx, ny, x, y), (x, y)) for x, y in found)
+        ranked = [r for r in ranked if r[0] < UNREACHABLE]
+        best = sorted(ranked) if k is None else heapq.nsmallest(k, ranked)
+        return [p for _, p in best]
+
+    def refresh(self) -> None:
+        cs = self.changes
+        if cs.full:
+            self.positions = {Team.RED: {}, Team.BLUE: {}}
+            self.kinds = {}
+            self.stations = {Team.RED: {}, Team.BLUE: {}}
+            self.station_of = {}
+            for team in (Team.RED, Team.BLUE):
+                m = self.game_state.get_map(team)
+                for x in range(m.width):
+                    for y in range(m.height):
+                        self.index_tile(team, x, y)
+        else:
+            for team, x, y in cs.tiles:
+                self.index_tile(team, x, y)
+        cs.clear()
+
+    def index_tile(self, team: Team, x: int, y: int) -> None:
+        key = (team, x, y)
+        t = self.game_state.get_map(team).tiles[x][y]
+        #an empty box has no items
+        kinds = item_kinds(t.item) if getattr(t, "count", 1) > 0 else []
+        self.relist(self.positions[team], self.kinds, key, kinds)
+        if t.is_station:
+            self.relist(self.stations[team], self.station_of, key, station_kinds(t))
+
+    @staticmethod
+    def relist(by_kind: Dict, listed: Dict, key: Tuple[Team, int, int], kinds: List) -> None:
+        '''move the tile from the kinds it was listed under to the new ones'''
+        pos = (key[1], key[2])
+        for kind in listed.pop(key, ()):
+            found = by_kind[kind]
+            found.discard(pos)
+            if not found:
+                del by_kind[kind]
+        if kinds:
+            listed[key] = kinds
+            for kind in kinds:
+                by_kind.setdefault(kind, set()).add(pos)
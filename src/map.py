@@ -2,7 +2,7 @@
 
 from game_constants import TileType, Team
 from tiles import Tile
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 class Map:
     '''
@@ -44,6 +44,10 @@ class Map:
         if self.orders is None:
             self.orders = []
 
+        self.stations = None #cached station positions, see station_positions()
+        self.positions: Dict[str, List[Tuple[int, int]]] = {} #cached positions by tile_name, see positions_of()
+        self.token = None #tiles with tile.owner == token can be written in place, None = all of them (never cloned)
+
 
     
     def in_bounds(self, x: int, y: int) -> bool:
@@ -89,6 +93,73 @@ class Map:
         
         return self.tiles[x][y].is_interactable
     
+    def station_positions(self) -> List[Tuple[int, int]]:
+        '''(x, y) of every station tile, in x then y order; tile types never change so this is cached'''
+        if self.stations is None:
+            self.stations = [
+                (x, y)
+                for x in range(self.width)
+                for y in range(self.height)
+                if self.tiles[x][y].is_station
+            ]
+        return self.stations
+
+    def positions_of(self, tile_name: str) -> List[Tuple[int, int]]:
+        '''(x, y) of every tile with that tile_name (e.g. "COOKER"), in x then y order; cached like station_positions()'''
+        found = self.positions.get(tile_name)
+        if found is None:
+            found = [
+                (x, y)
+                for x in range(self.width)
+                for y in range(self.height)
+                if self.tiles[x][y].tile_name == tile_name
+            ]
+            self.positions[tile_name] = found
+        return found
+
+    def clone(self, copy_owned: bool = False) -> "Map":
+        '''
+        structural copy of the map: stations get their own copy, every other tile is
+        shared by both maps until one of them writes to it (see tile_for_write)
+
+        copy_owned: also copy every tile this map owns, they may have been changed in place and
+        would be changed back under the clone (GameState.clone() inside a checkpoint)
+        '''
+        stations = self.station_positions()
+        copied = stations
+        if copy_owned:
+            #without a token the map owns every tile
+            copied = [
+                (x, y)
+                for x in range(self.width)
+                for y in range(self.height)
+                if self.tiles[x][y].owner is self.token or self.tiles[x][y].is_station
+            ]
+
+        m = Map(width=self.width, height=self.height, tiles=[col[:] for col in self.tiles], team=self.team, orders=self.orders)
+        m.stations = stations
+        m.positions = self.positions #tile types never change, the index is shared by every clone
+
+        #new tokens on both sides: every tile we had is now shared, except the copied ones
+        self.token = object()
+        m.token = object()
+        for x, y in copied:
+            t = self.tiles[x][y].copy()
+            t.owner = m.token
+            m.tiles[x][y] = t
+            self.tiles[x][y].owner = self.token
+
+        return m
+
+    def tile_for_write(self, x: int, y: int) -> Tile:
+        '''tile at (x, y) that is about to change, copied first if it is shared with a clone'''
+        t = self.tiles[x][y]
+        if self.token is not None and t.owner is not self.token:
+            t = t.copy()
+            t.owner = self.token
+            self.tiles[x][y] = t
+        return t
+
     def to_2d_list(self):
         '''
         converts the map into a 2D list of tile dictionaries containing full state
@@ -6,10 +6,10 @@ from typing import Dict, List, Tuple, Optional
 
 import copy
 
-from game_constants import Team, FoodType, GameConstants
+from game_constants import Team, FoodType, GameConstants, Rules
 from map import Map
 from tiles import Tile, Floor, Wall, Counter, Sink, SinkTable, Cooker, Trash, Submit, Shop, Box
-from game_state import Order
+from game_state import Order, GameState, order_signature
 
 
 # ----------------------------
@@ -42,6 +42,8 @@ class ParsedMap:
     switch_turn: int
     switch_duration: int
 
+    rules: Rules = Rules() #GameConstants with the map's RULES: line applied
+
 
 def parse_switch_line(line: str, default_turn: int, default_duration: int) -> Tuple[int, int]:
     '''
@@ -88,8 +90,26 @@ def extract_optional_switch_config(lines: List[str]) -> Tuple[List[str], int, in
     return kept, switch_turn, switch_duration
 
 
-def clone_tiles_grid(tiles: List[List[Tile]]) -> List[List[Tile]]:
-    return copy.deepcopy(tiles)
+def extract_optional_rules(lines: List[str]) -> Tuple[List[str], Rules]:
+    '''
+    remove the rules line, accepts in format: RULES: cook_progress=15 burn_progress=30 starting_money=200
+    (any field of game_constants.Rules)
+    '''
+    rules = Rules()
+    kept: List[str] = []
+    for ln in lines:
+        s = ln.strip()
+        if s.upper().startswith("RULES:"):
+            values: Dict[str, int] = {}
+            for tok in s.split(":", 1)[1].split():
+                if '=' not in tok:
+                    raise ValueError(f'Bad rules token "{tok}". Expected key=value.')
+                k, v = tok.split('=', 1)
+                values[k.strip().lower()] = int(v)
+            rules = rules.override(**values)
+            continue
+        kept.append(ln)
+    return kept, rules
 
 
 def read_nonempty_noncomment_lines(raw_lines: List[str]) -> List[str]:
@@ -186,6 +206,7 @@ def parse_order_line(line: str, *, next_order_id: int, default_reward: int, defa
         expires_turn=start + duration,
         reward=reward,
         penalty=penalty,
+        signature=order_signature(required), #matched against plates on every submit
     )
 
     return order, next_order_id + 1
@@ -210,6 +231,7 @@ def load_map_from_txt(
 
     lines = read_nonempty_noncomment_lines(raw_lines)
     lines, switch_turn, switch_duration = extract_optional_switch_config(lines)
+    lines, rules = extract_optional_rules(lines)
     layout_lines, order_lines = split_layout_and_orders(lines)
 
     if not layout_lines:
@@ -254,7 +276,7 @@ def load_map_from_txt(
             orders.append(parsed)
 
     m = Map(width=width, height=height, tiles=tiles, team=team, orders=[])  # Map.orders is unused in your GameState
-    return ParsedMap(map_obj=m, spawns_red=spawns_red, spawns_blue=spawns_blue, orders=orders, switch_turn=switch_turn, switch_duration=switch_duration)
+    return ParsedMap(map_obj=m, spawns_red=spawns_red, spawns_blue=spawns_blue, orders=orders, switch_turn=switch_turn, switch_duration=switch_duration, rules=rules)
 
 
 def load_two_team_maps_and_orders(path: str, default_reward: int = 5, default_penalty: int = 2) -> Tuple[Map, Map, List[Order], List[Order], ParsedMap]:
@@ -272,15 +294,73 @@ def load_two_team_maps_and_orders(path: str, default_reward: int = 5, default_pe
     )
 
     map_red = parsed.map_obj
-    map_blue = Map(
-        width=map_red.width,
-        height=map_red.height,
-        tiles=clone_tiles_grid(map_red.tiles),
-        team=Team.BLUE,
-        orders=[],
-    )
+    #copy-on-write: both maps share every tile until one of them writes to it, stations are copied right away
+    map_blue = map_red.clone()
+    map_blue.team = Team.BLUE
+    map_blue.orders = []
 
     orders_red = parsed.orders
     orders_blue = copy.deepcopy(parsed.orders)
 
     return map_red, map_blue, orders_red, orders_blue, parsed
+
+
+def find_default_floor_spawn(m: Map, prefer_center=True) -> Tuple[int, int]:
+    '''if map has no red, blue spawn markers, find the centermost walkable spawn'''
+    if prefer_center:
+        cx, cy = m.width // 2, m.height // 2
+        for r in range(min(m.width, m.height)):
+            for dx in range(-r, r + 1):
+                for dy in range(-r, r + 1):
+                    x, y = cx + dx, cy + dy
+                    if m.in_bounds(x, y) and getattr(m.tiles[x][y], "is_walkable", False):
+                        return (x, y)
+    for y in range(m.height):
+        for x in range(m.width):
+            if getattr(m.tiles[x][y], "is_walkable", False):
+                return (x, y)
+    return (0, 0)
+
+
+def load_game_state(path: str, default_reward: int = 5, default_penalty: int = 2, rules: Optional[Rules] = None) -> Tuple[GameState, ParsedMap]:
+    '''
+    builds the starting GameState of a map file (maps, switch window, orders and bots on their spawns);
+    rules replace the map's own (its RULES: line, else GameConstants)
+
+    returns
+      (game_state, parsed)
+    '''
+    map_red, map_blue, orders_red, orders_blue, parsed = load_two_team_maps_and_orders(path, default_reward, default_penalty)
+
+    game_state = GameState(red_map=map_red, blue_map=map_blue, rules=rules if rules is not None else parsed.rules)
+
+    #get midgame switch window from map
+    game_state.switch_turn = getattr(parsed, "switch_turn", GameConstants.MIDGAME_SWITCH_TURN)
+    game_state.switch_duration = getattr(parsed, "switch_duration", GameConstants.MIDGAME_SWITCH_DURATION)
+
+    #load orders into the game state
+    game_state.orders[Team.RED] = orders_red
+    game_state.orders[Team.BLUE] = orders_blue
+
+    #make next_order_id to avoid collisions if spawn_order() is useed later
+    max_id = 0
+    for o in orders_red:
+        max_id = max(max_id, o.order_id)
+    game_state.next_order_id = max_id + 1
+
+    #put the bots in the parsed map
+    if parsed.spawns_red:
+        for (x, y) in parsed.spawns_red:
+            game_state.add_bot(Team.RED, x, y)
+    else:
+        x, y = find_default_floor_spawn(game_state.red_map)
+        game_state.add_bot(Team.RED, x, y)
+
+    if parsed.spawns_blue:
+        for (x, y) in parsed.spawns_blue:
+            game_state.add_bot(Team.BLUE, x, y)
+    else:
+        x, y = find_default_floor_spawn(game_state.blue_map)
+        game_state.add_bot(Team.BLUE, x, y)
+
+    return game_state, parsed
@@ -0,0 +1,227 @@
+# match_server.py
+"""
+Fork server for running many matches: the engine, the bot files and the maps are loaded once in this
+process, then every match runs in a forked child (copy-on-write memory) that sends its result back
+over a pipe.
+
+    server = MatchServer(["bots/a.py", "bots/b.py"], ["maps/map1.txt"])
+    server.play("bots/a.py", "bots/b.py", "maps/map1.txt")                  #one match -> MatchResult
+    server.play_many([(red, blue, map_path), ...], workers=8)               #MatchResults in order
+
+A child never re-imports the engine, re-reads or re-compiles a bot file or re-parses a map; it only
+runs the bot modules' code (a fresh module per team, like game.py) and plays the game. Needs
+os.fork() (Linux / macOS).
+
+Benchmark of the per-match startup cost (matches of 0 turns) against a new `python src/game.py` process:
+    python src/match_server.py --red bots/default_bot.py --blue bots/default_bot.py --map maps/map1.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import pickle
+import select
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from game_constants import Team, Rules
+from game_state import GameState
+from map_processor import load_game_state
+from game import Game, compile_file
+
+
+@dataclass
+class MatchResult:
+    red: str
+    blue: str
+    map_path: str
+    winner: Optional[str] #"RED", "BLUE" or None for a draw (or a crash of both)
+    red_money: int = 0
+    blue_money: int = 0
+    turns: int = 0
+    seconds: float = 0.0 #wall time of the child
+    error: Optional[str] = None #traceback if the match could not be played
+
+
+class MatchServer:
+    '''loads bots and maps once and forks a child per match, see the module docstring'''
+
+    def __init__(
+        self,
+        bot_paths: Iterable[str],
+        map_paths: Iterable[str],
+        turn_limit: Optional[int] = None,
+        per_turn_timeout_s: float = 0.6,
+        quiet: bool = True,
+        trusted: bool = False,
+        rules: Optional[Rules] = None,
+    ):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("MatchServer needs os.fork()")
+        self.per_turn_timeout_s = per_turn_timeout_s
+        self.quiet = quiet #children drop what the game and the bots print
+        self.trusted = trusted #Game(trusted=True), for self-play of your own bots
+
+        self.bot_code: Dict[str, Any] = {path: compile_file(path) for path in bot_paths}
+        self.turn_limit = turn_limit #None: the rules' total_turns
+        #rules replace the maps' own, one server per rule variant
+        self.maps: Dict[str, GameState] = {path: load_game_state(path, rules=rules)[0] for path in map_paths}
+
+        #everything loaded so far is never freed: keep the collector away from it so the children's
+        #garbage collections do not copy those pages
+        gc.collect()
+        gc.freeze()
+
+    def play(self, red: str, blue: str, map_path: str, replay_path: Optional[str] = None) -> MatchResult:
+        return self.play_many([(red, blue, map_path, replay_path)], workers=1)[0]
+
+    def play_many(self, matches: Sequence[Tuple[str, ...]], workers: int = 1) -> List[MatchResult]:
+        '''
+        play (red, blue, map_path) or (red, blue, map_path, replay_path) matches, at most `workers`
+        at the same time; the results are in the order of the matches
+        '''
+        results: List[Optional[MatchResult]] = [None] * len(matches)
+        running: Dict[int, Tuple[int, int, List[bytes]]] = {} #read fd -> (match index, pid, data so far)
+        todo = list(enumerate(matches))
+        todo.reverse()
+
+        while todo or running:
+            while todo and len(running) < max(1, workers):
+                i, match = todo.pop()
+                r, pid = self.fork_match(*match)
+                running[r] = (i, pid, [])
+
+            ready, _, _ = select.select(list(running), [], [])
+            for r in ready:
+                i, pid, chunks = running[r]
+                data = os.read(r, 1 << 16)
+                if data:
+                    chunks.append(data)
+                    continue
+                #EOF: the child is done
+                os.close(r)
+                del running[r]
+                os.waitpid(pid, 0)
+                red, blue, map_path = matches[i][:3]
+                try:
+                    results[i] = pickle.loads(b"".join(chunks))
+                except Exception:
+                    results[i] = MatchResult(red, blue, map_path, None, error="match process died without a result")
+        return results
+
+    # ----------------------------
+    # Child side
+    # ----------------------------
+
+    def fork_match(self, red: str, blue: str, map_path: str, replay_path: Optional[str] = None) -> Tuple[int, int]:
+        '''start a child playing the match, returns (read end of its result pipe, pid)'''
+        if map_path not in self.maps:
+            raise KeyError(f"map {map_path} was not loaded by the server")
+        r, w = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            os.close(w)
+            return r, pid
+
+        #child: play, write the result and leave without running the parent's cleanup
+        status = 0
+        try:
+            os.close(r)
+            result = self.run_match(red, blue, map_path, replay_path)
+            with os.fdopen(w, "wb") as f:
+                pickle.dump(result, f)
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    def run_match(self, red: str, blue: str, map_path: str, replay_path: Optional[str]) -> MatchResult:
+        t0 = time.perf_counter()
+        if self.quiet:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, 1)
+            sys.stdout = open(1, "w", closefd=False)
+        try:
+            game = Game(
+                red,
+                blue,
+                map_path,
+                replay_path=replay_path,
+                turn_limit=self.turn_limit,
+                per_turn_timeout_s=self.per_turn_timeout_s,
+                game_state=self.maps[map_path],
+                bot_code=self.bot_code,
+                trusted=self.trusted,
+            )
+            winner = game.run_game()
+        except Exception:
+            return MatchResult(red, blue, map_path, None, seconds=time.perf_counter() - t0, error=traceback.format_exc())
+
+        gs = game.game_state
+        return MatchResult(
+            red,
+            blue,
+            map_path,
+            None if winner is None else winner.name,
+            gs.get_team_money(Team.RED),
+            gs.get_team_money(Team.BLUE),
+            gs.turn,
+            time.perf_counter() - t0,
+        )
+
+
+def main():
+    '''per-match startup cost of a new game.py process versus a forked child, then optionally full matches'''
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--red", required=True, help="path to red bot python file (defines BotPlayer)")
+    ap.add_argument("--blue", required=True, help="path to blue bot python file (defines BotPlayer)")
+    ap.add_argument("--map", required=True, help="path to map text file")
+    ap.add_argument("--startups", type=int, default=20, help="matches of 0 turns timed each way")
+    ap.add_argument("--matches", type=int, default=0, help="full matches to play on the server afterwards")
+    ap.add_argument("--workers", type=int, default=1, help="matches played at the same time (up to the number of cores, bots still get per-turn timeouts)")
+    ap.add_argument("--turns", type=int, default=None, help="turn limit of the full matches (default: the map's rules)")
+    args = ap.parse_args()
+
+    game_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game.py")
+    cmd = [sys.executable, game_py, "--red", args.red, "--blue", args.blue, "--map", args.map, "--turns", "0"]
+    t0 = time.perf_counter()
+    for _ in range(args.startups):
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+    before = (time.perf_counter() - t0) / args.startups
+
+    t0 = time.perf_counter()
+    server = MatchServer([args.red, args.blue], [args.map], turn_limit=0)
+    load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    results = server.play_many([(args.red, args.blue, args.map)] * args.startups)
+    after = (time.perf_counter() - t0) / args.startups
+    for res in results:
+        if res.error:
+            print(res.error)
+            return
+
+    print(f"[BENCH] startup per match: new process {before * 1000:.1f}ms, fork server {after * 1000:.1f}ms "
+          f"({before / after:.0f}x, server loaded in {load * 1000:.1f}ms)")
+
+    if args.matches > 0:
+        server.turn_limit = args.turns
+        t0 = time.perf_counter()
+        results = server.play_many([(args.red, args.blue, args.map)] * args.matches, workers=args.workers)
+        dt = time.perf_counter() - t0
+        wins = {name: sum(r.winner == name for r in results) for name in ("RED", "BLUE", None)}
+        errors = sum(r.error is not None for r in results)
+        turns = sum(r.turns for r in results) / args.matches
+        print(f"[BENCH] {args.matches} matches ({args.workers} workers) in {dt:.3f}s -> {args.matches / dt:.2f} matches/s; "
+              f"{turns:.0f} turns on average, RED {wins['RED']}, BLUE {wins['BLUE']}, draws {wins[None]}, errors {errors}")
+
+
+if __name__ == "__main__":
+    main()
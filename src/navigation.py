@@ -0,0 +1,77 @@
+# navigation.py
+"""
+Shortest-path stepping behind RobotController.move_to().
+
+    controller.move_to(bot_id, x, y)      #register a goal (and take the first step if the bot can move)
+    controller.cancel_move_to(bot_id)
+
+A goal is a tile the bot should get next to (Chebyshev distance <= 1, so it can act on it). After the
+team's play_turn the engine calls controller.advance_navigation(), which moves every bot that has a
+goal and has not moved yet one step closer; a bot that is already next to its goal drops it.
+
+Steps follow the walking distance fields of recipe_dag.StationDistances (one BFS per goal tile per map,
+cached for the whole game and shared by GameState clones). When the best steps are blocked by other
+bots, a BFS that treats bots as walls finds a way around; if there is none the bot waits.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from game_constants import Team
+from game_state import GameState
+from recipe_dag import StationDistances, UNREACHABLE
+
+
+STEPS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+class Navigator:
+    '''cached distance fields of both maps of a game'''
+
+    def __init__(self):
+        self.distances: Dict[Team, StationDistances] = {}
+
+    def field(self, gs: GameState, team: Team, tx: int, ty: int):
+        d = self.distances.get(team)
+        if d is None:
+            d = StationDistances(gs.get_map(team))
+            self.distances[team] = d
+        return d.field_at(tx, ty)
+
+    def distance(self, gs: GameState, team: Team, x: int, y: int, tx: int, ty: int) -> int:
+        '''walking turns from (x, y) to next to (tx, ty), UNREACHABLE if there is no way'''
+        m = gs.get_map(team)
+        if not m.in_bounds(x, y) or not m.in_bounds(tx, ty):
+            return UNREACHABLE
+        return self.field(gs, team, tx, ty)[x][y]
+
+    def next_step(self, gs: GameState, team: Team, x: int, y: int, tx: int, ty: int) -> Optional[Tuple[int, int]]:
+        '''(dx, dy) of a step towards next to (tx, ty) into a free tile, None if there is none right now'''
+        m = gs.get_map(team)
+        occ = gs.occupancy[team]
+        f = self.field(gs, team, tx, ty)
+        cur = f[x][y]
+
+        for dx, dy in STEPS:
+            nx, ny = x + dx, y + dy
+            if m.in_bounds(nx, ny) and f[nx][ny] < cur and occ[nx][ny] is None and m.is_tile_walkable(nx, ny):
+                return (dx, dy)
+
+        #blocked: go around the other bots
+        first: Dict[Tuple[int, int], Tuple[int, int]] = {(x, y): (0, 0)}
+        queue = deque([(x, y)])
+        while queue:
+            cx, cy = queue.popleft()
+            if f[cx][cy] == 0:
+                return first[(cx, cy)]
+            for dx, dy in STEPS:
+                nx, ny = cx + dx, cy + dy
+                if (nx, ny) in first or not m.in_bounds(nx, ny):
+                    continue
+                if not m.is_tile_walkable(nx, ny) or occ[nx][ny] is not None:
+                    continue
+                first[(nx, ny)] = first[(cx, cy)] if (cx, cy) != (x, y) else (dx, dy)
+                queue.append((nx, ny))
+        return None
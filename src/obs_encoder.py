@@ -0,0 +1,275 @@
+# obs_encoder.py
+"""
+Fixed-shape tensor observation of a GameState from one team's point of view.
+
+Everything is written into numpy buffers allocated once per encoder:
+
+    planes  (2, PLANE_CHANNELS, width, height)   map 0 = own map, map 1 = enemy map
+    bots    (num_bots, BOT_FEATURES)              own bots first, then the enemy's, by bot_id
+    orders  (2, max_orders, ORDER_FEATURES)       own orders, then the enemy's
+    scalars (SCALAR_FEATURES,)
+
+The encoder watches its GameState (GameState.watch()), so after the first encode() only the tiles and
+bots that were touched since the previous call are rewritten. Orders, scalars and cook progress are few and
+depend on the turn, they are rewritten every time.
+
+Needs numpy (requirements.txt).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from game_constants import Team, TileType, FoodType
+from game_state import GameState
+from item import Item, Food, Plate, Pan
+
+
+# ----------------------------
+# Layout
+# ----------------------------
+
+TILE_TYPES: List[TileType] = list(TileType)
+TILE_CHANNEL = {tt.tile_id: i for i, tt in enumerate(TILE_TYPES)} #tile_id -> one-hot channel
+
+#item features: kind flags, food counts by food_id, then how processed the food is
+ITEM_PLATE = 0
+ITEM_PAN = 1
+ITEM_FOOD = 2
+ITEM_DIRTY = 3
+ITEM_FOOD_COUNTS = 4
+ITEM_CHOPPED = ITEM_FOOD_COUNTS + len(FoodType)
+ITEM_COOKED = ITEM_CHOPPED + 1
+ITEM_BURNT = ITEM_COOKED + 1
+ITEM_FEATURES = ITEM_BURNT + 1
+
+#plane channels
+CH_TILE = 0
+CH_ITEM = CH_TILE + len(TILE_TYPES)
+CH_COOK_PROGRESS = CH_ITEM + ITEM_FEATURES
+CH_COUNT = CH_COOK_PROGRESS + 1 #items in a box, dirty plates in a sink or clean plates on a sink table
+CH_USING = CH_COUNT + 1
+CH_OWN_BOT = CH_USING + 1
+CH_ENEMY_BOT = CH_OWN_BOT + 1
+PLANE_CHANNELS = CH_ENEMY_BOT + 1
+
+#bot features: x, y, on the enemy map, enemy bot, then the held item
+BOT_HOLDING = 4
+BOT_FEATURES = BOT_HOLDING + ITEM_FEATURES
+
+#order features: required food counts by food_id, then reward, penalty, turns until it starts/expires, status
+ORDER_REWARD = len(FoodType)
+ORDER_PENALTY = ORDER_REWARD + 1
+ORDER_STARTS_IN = ORDER_PENALTY + 1
+ORDER_EXPIRES_IN = ORDER_STARTS_IN + 1
+ORDER_ACTIVE = ORDER_EXPIRES_IN + 1
+ORDER_COMPLETED = ORDER_ACTIVE + 1
+ORDER_PRESENT = ORDER_COMPLETED + 1 #0 for padding rows
+ORDER_FEATURES = ORDER_PRESENT + 1
+
+#scalars
+SC_MONEY = 0
+SC_ENEMY_MONEY = 1
+SC_TURN = 2
+SC_TURNS_LEFT = 3
+SC_SWITCH_ACTIVE = 4
+SC_SWITCHED = 5
+SC_ENEMY_SWITCHED = 6
+SC_SWITCH_STARTS_IN = 7
+SC_SWITCH_ENDS_IN = 8
+SCALAR_FEATURES = 9
+
+
+def write_item_features(out: np.ndarray, it: Optional[Item]) -> None:
+    '''write the ITEM_FEATURES of an item into out (which must be zeroed)'''
+    if it is None:
+        return
+    if isinstance(it, Food):
+        out[ITEM_FOOD] = 1
+        add_food(out, it)
+    elif isinstance(it, Pan):
+        out[ITEM_PAN] = 1
+        if it.food is not None:
+            add_food(out, it.food)
+    elif isinstance(it, Plate):
+        out[ITEM_PLATE] = 1
+        out[ITEM_DIRTY] = it.dirty
+        for f in it.food:
+            if isinstance(f, Food):
+                add_food(out, f)
+
+
+def add_food(out: np.ndarray, f: Food) -> None:
+    out[ITEM_FOOD_COUNTS + f.food_id] += 1
+    out[ITEM_CHOPPED] += f.chopped
+    out[ITEM_COOKED] += f.cooked_stage == 1
+    out[ITEM_BURNT] += f.cooked_stage == 2
+
+
+# ----------------------------
+# Encoder
+# ----------------------------
+
+class ObservationEncoder:
+    '''keeps the observation buffers of one team up to date with a GameState'''
+
+    def __init__(
+        self,
+        game_state: GameState,
+        team: Team,
+        max_orders: Optional[int] = None,
+        turn_limit: Optional[int] = None,
+        buffers: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        '''buffers: arrays of the right shapes to encode into (e.g. rows of a batch, see vec_game.py) instead of new ones'''
+        self.team = team
+        self.turn_limit = turn_limit if turn_limit is not None else game_state.rules.total_turns
+
+        self.width = game_state.red_map.width
+        self.height = game_state.red_map.height
+        self.max_orders = max_orders if max_orders is not None else max(len(o) for o in game_state.orders.values())
+
+        if buffers is not None:
+            self.planes = buffers["planes"]
+            self.bots = buffers["bots"]
+            self.orders = buffers["orders"]
+            self.scalars = buffers["scalars"]
+        else:
+            self.planes = np.zeros((2, PLANE_CHANNELS, self.width, self.height), dtype=np.float32)
+            self.bots = np.zeros((len(game_state.bots), BOT_FEATURES), dtype=np.float32)
+            self.orders = np.zeros((2, self.max_orders, ORDER_FEATURES), dtype=np.float32)
+            self.scalars = np.zeros((SCALAR_FEATURES,), dtype=np.float32)
+
+        self.game_state: Optional[GameState] = None
+        self.changes = None
+        self.attach(game_state)
+
+    def attach(self, game_state: GameState) -> None:
+        '''switch to another game state on the same map (e.g. after a reset), the next encode() is a full one'''
+        if self.game_state is not None:
+            self.game_state.unwatch(self.changes)
+        self.game_state = game_state
+        self.changes = game_state.watch()
+
+        #own bots first; a bot's row never changes
+        enemy = game_state.other_team(self.team)
+        ids = sorted(game_state.bots)
+        self.bot_rows = {bot_id: row for row, bot_id in enumerate(
+            [i for i in ids if game_state.bots[i].team == self.team] + [i for i in ids if game_state.bots[i].team == enemy]
+        )}
+        self.bot_cells: Dict[int, tuple] = {} #where each bot was drawn on the occupancy planes
+
+    def close(self) -> None:
+        '''stop tracking changes of the game state'''
+        if self.game_state is not None:
+            self.game_state.unwatch(self.changes)
+            self.game_state = None
+
+    def map_index(self, map_team: Team) -> int:
+        return 0 if map_team == self.team else 1
+
+    def encode(self) -> Dict[str, np.ndarray]:
+        '''
+        bring the buffers up to date and return them: {"planes", "bots", "orders", "scalars"};
+        the arrays are reused by the next call, copy them to keep them
+        '''
+        gs = self.game_state
+        cs = self.changes
+
+        if cs.full:
+            self.planes.fill(0)
+            self.bots.fill(0)
+            self.bot_cells.clear()
+            for team in (Team.RED, Team.BLUE):
+                m = gs.get_map(team)
+                for x in range(m.width):
+                    for y in range(m.height):
+                        self.write_tile(team, x, y)
+            for bot_id in gs.bots:
+                self.write_bot(bot_id)
+        else:
+            for team, x, y in cs.tiles:
+                self.write_tile(team, x, y)
+            for bot_id in cs.bots:
+                self.write_bot(bot_id)
+        cs.clear()
+
+        #cook progress follows the turn without the cooker being touched
+        for team in (Team.RED, Team.BLUE):
+            m = gs.get_map(team)
+            progress = self.planes[self.map_index(team), CH_COOK_PROGRESS]
+            for x, y in m.positions_of("COOKER"):
+                progress[x, y] = m.tiles[x][y].cook_progress
+
+        self.write_orders()
+        self.write_scalars()
+        return {"planes": self.planes, "bots": self.bots, "orders": self.orders, "scalars": self.scalars}
+
+    def write_tile(self, team: Team, x: int, y: int) -> None:
+        t = self.game_state.get_map(team).tiles[x][y]
+        cell = self.planes[self.map_index(team), :CH_OWN_BOT, x, y] #occupancy is written by write_bot
+        cell.fill(0)
+
+        cell[CH_TILE + TILE_CHANNEL[t.tile_id]] = 1
+        write_item_features(cell[CH_ITEM:CH_ITEM + ITEM_FEATURES], t.item)
+        cell[CH_COOK_PROGRESS] = getattr(t, "cook_progress", 0)
+        cell[CH_COUNT] = getattr(t, "count", 0) + getattr(t, "num_dirty_plates", 0) + getattr(t, "num_clean_plates", 0)
+        cell[CH_USING] = t.using
+
+    def write_bot(self, bot_id: int) -> None:
+        row = self.bot_rows.get(bot_id)
+        if row is None:
+            return
+
+        old = self.bot_cells.pop(bot_id, None)
+        if old is not None:
+            self.planes[old] -= 1
+
+        out = self.bots[row]
+        out.fill(0)
+        b = self.game_state.bots.get(bot_id)
+        if b is None:
+            return
+
+        own = b.team == self.team
+        m = self.map_index(b.map_team)
+        out[0] = b.x
+        out[1] = b.y
+        out[2] = m
+        out[3] = not own
+        write_item_features(out[BOT_HOLDING:], b.holding)
+
+        cell = (m, CH_OWN_BOT if own else CH_ENEMY_BOT, b.x, b.y)
+        self.planes[cell] += 1
+        self.bot_cells[bot_id] = cell
+
+    def write_orders(self) -> None:
+        gs = self.game_state
+        self.orders.fill(0)
+        for i, team in enumerate((self.team, gs.other_team(self.team))):
+            for row, o in zip(self.orders[i], gs.orders.get(team, [])):
+                for ft in o.required:
+                    row[ft.food_id] += 1
+                row[ORDER_REWARD] = o.reward
+                row[ORDER_PENALTY] = o.penalty
+                row[ORDER_STARTS_IN] = o.created_turn - gs.turn
+                row[ORDER_EXPIRES_IN] = o.expires_turn - gs.turn
+                row[ORDER_ACTIVE] = o.is_active(gs.turn)
+                row[ORDER_COMPLETED] = o.completed_turn is not None
+                row[ORDER_PRESENT] = 1
+
+    def write_scalars(self) -> None:
+        gs = self.game_state
+        enemy = gs.other_team(self.team)
+        sc = self.scalars
+        sc[SC_MONEY] = gs.get_team_money(self.team)
+        sc[SC_ENEMY_MONEY] = gs.get_team_money(enemy)
+        sc[SC_TURN] = gs.turn
+        sc[SC_TURNS_LEFT] = self.turn_limit - gs.turn
+        sc[SC_SWITCH_ACTIVE] = gs.switch_window_active()
+        sc[SC_SWITCHED] = gs.switched.get(self.team, False)
+        sc[SC_ENEMY_SWITCHED] = gs.switched.get(enemy, False)
+        sc[SC_SWITCH_STARTS_IN] = gs.switch_turn - gs.turn
+        sc[SC_SWITCH_ENDS_IN] = gs.switch_turn + gs.switch_duration - 1 - gs.turn
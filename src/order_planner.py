@@ -0,0 +1,248 @@
+# order_planner.py
+"""
+Picks and orders the set of orders that earns the team the most money.
+
+    planner = OrderPlanner(map_copy, num_bots=2, rules=controller.get_rules())   #in BotPlayer.__init__
+    plan = planner.plan(controller.get_orders(team), controller.get_turn(),
+                        controller.get_team_money(team), time_budget_s=0.05)
+    plan.sequence                                                 #order ids, work on them in this order
+
+Model: the bots work through the chosen orders one after another (or in `lanes` parallel groups),
+each order taking TaskDAG.makespan(bots per lane) turns from recipe_dag.py. An order can be prepared
+before it starts but only submitted while it is active. Completing an order earns its reward, saves its
+penalty and costs its ingredients plus a plate; ingredients have to be affordable when the order starts
+(otherwise the lane waits for passive income or the reward of an order finishing on another lane), and a
+reward only counts from the turn its order is submitted.
+
+The search is a depth first branch-and-bound over sequences with a dominance table (same set of
+orders reached later and poorer is pruned), seeded with the previous plan and a greedy plan, and it
+stops at the time budget with the best plan found so far.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from game_constants import ShopCosts, Rules
+from map import Map
+from recipe_dag import RecipeCompiler, UNREACHABLE, to_food_type
+
+
+@dataclass
+class Candidate:
+    '''an order that can still be completed'''
+    order_id: int
+    created_turn: int
+    expires_turn: int
+    duration: int
+    cost: int
+    reward: int
+    profit: int #reward + penalty - cost
+
+
+@dataclass
+class Plan:
+    sequence: List[int] = field(default_factory=list) #order ids in the order they should be done
+    finish: Dict[int, int] = field(default_factory=dict) #order id -> estimated submit turn
+    value: int = 0 #money earned compared to doing nothing
+    complete: bool = True #False if the search ran out of time
+
+
+Credits = Tuple[Tuple[int, int], ...] #(submit turn, reward) of the orders placed so far, sorted
+
+
+def paid_no_later(a: Credits, b: Credits) -> bool:
+    '''whether by every turn the rewards of a add up to at least those of b'''
+    total_a = total_b = 0
+    i = 0
+    for turn, reward in b:
+        total_b += reward
+        while i < len(a) and a[i][0] <= turn:
+            total_a += a[i][1]
+            i += 1
+        if total_a < total_b:
+            return False
+    return True
+
+
+def order_field(order: Any, name: str) -> Any:
+    '''orders may be controller.get_orders() dicts or game_state.Order objects'''
+    return order[name] if isinstance(order, dict) else getattr(order, name)
+
+
+class OrderPlanner:
+    '''keeps the recipe DAGs and the last plan between turns, see the module docstring'''
+
+    def __init__(self, m: Map, num_bots: int, lanes: int = 1, safety_turns: int = 0, turn_limit: Optional[int] = None, rules: Optional[Rules] = None):
+        self.rules = rules if rules is not None else Rules()
+        self.compiler = RecipeCompiler(m, self.rules)
+        self.num_bots = num_bots
+        self.lanes = max(1, min(lanes, num_bots))
+        self.safety_turns = safety_turns #extra turns assumed per order
+        self.turn_limit = turn_limit if turn_limit is not None else self.rules.total_turns
+        self.last_plan = Plan()
+
+    def candidates(self, orders: Sequence[Any], turn: int, durations: Optional[Dict[int, int]] = None) -> List[Candidate]:
+        '''orders that are not done or expired yet and can be made on this map'''
+        bots_per_lane = max(1, self.num_bots // self.lanes)
+        out: List[Candidate] = []
+        for o in orders:
+            if order_field(o, "completed_turn") is not None:
+                continue
+            expires = min(order_field(o, "expires_turn"), self.turn_limit)
+            if expires < turn:
+                continue
+
+            required = [to_food_type(f) for f in order_field(o, "required")]
+            order_id = order_field(o, "order_id")
+            if durations is not None and order_id in durations:
+                duration = durations[order_id] #already being worked on
+            else:
+                duration = self.compiler.compile(required).makespan(bots_per_lane)
+                if duration >= UNREACHABLE:
+                    continue
+                duration += self.safety_turns
+
+            cost = sum(ft.buy_cost for ft in required) + ShopCosts.PLATE.buy_cost
+            profit = order_field(o, "reward") + order_field(o, "penalty") - cost
+            if profit <= 0:
+                continue
+            out.append(Candidate(order_id, order_field(o, "created_turn"), expires, duration, cost, order_field(o, "reward"), profit))
+        return out
+
+    def plan(
+        self,
+        orders: Sequence[Any],
+        turn: int,
+        money: int,
+        time_budget_s: float = 0.05,
+        durations: Optional[Dict[int, int]] = None,
+    ) -> Plan:
+        '''
+        best plan found within the time budget; durations overrides the estimated
+        remaining turns of orders that are already in progress
+        '''
+        deadline = time.perf_counter() + time_budget_s
+        cands = self.candidates(orders, turn, durations)
+        by_id = {c.order_id: c for c in cands}
+
+        #most profit per turn first, so good plans are found early
+        cands.sort(key=lambda c: (-c.profit / max(1, c.duration), c.expires_turn))
+
+        best = Plan(complete=True)
+        for seed in (
+            [i for i in self.last_plan.sequence if i in by_id],
+            self.greedy(cands, turn, money),
+        ):
+            p = self.evaluate([by_id[i] for i in seed], turn, money)
+            if p.value > best.value:
+                best = p
+
+        seen: Dict[frozenset, List[Tuple[Tuple[int, ...], Credits]]] = {} #chosen set -> (lane times, rewards) reached
+        lanes0 = (turn,) * self.lanes
+        nodes = 0
+
+        def dfs(chosen: List[Candidate], chosen_ids: frozenset, lanes: Tuple[int, ...], cash: int, credits: Credits, value: int, finish: Dict[int, int]) -> bool:
+            '''returns False once the time budget is used up'''
+            nonlocal best, nodes
+            nodes += 1
+            if nodes & 63 == 0 and time.perf_counter() > deadline:
+                return False
+
+            if value > best.value:
+                best = Plan([c.order_id for c in chosen], dict(finish), value, True)
+
+            #bound: everything that could still fit on its own
+            start = lanes[0]
+            bound = value + sum(
+                c.profit for c in cands
+                if c.order_id not in chosen_ids and max(start + c.duration, c.created_turn) <= c.expires_turn
+            )
+            if bound <= best.value:
+                return True
+
+            #dominance: this set (so the same money spent) was already reached with lanes free no later
+            #and the rewards in no later
+            states = seen.setdefault(chosen_ids, [])
+            for other_lanes, other_credits in states:
+                if all(a <= b for a, b in zip(other_lanes, lanes)) and paid_no_later(other_credits, credits):
+                    return True
+            states.append((lanes, credits))
+
+            for c in cands:
+                if c.order_id in chosen_ids:
+                    continue
+                nxt = self.place(c, lanes, cash, credits, turn)
+                if nxt is None:
+                    continue
+                new_lanes, done, new_cash, new_credits = nxt
+                finish[c.order_id] = done
+                chosen.append(c)
+                ok = dfs(chosen, chosen_ids | {c.order_id}, new_lanes, new_cash, new_credits, value + c.profit, finish)
+                chosen.pop()
+                del finish[c.order_id]
+                if not ok:
+                    return False
+            return True
+
+        finished = dfs([], frozenset(), lanes0, money, (), 0, {})
+        best.complete = finished
+        self.last_plan = best
+        return best
+
+    def place(self, c: Candidate, lanes: Tuple[int, ...], cash: int, credits: Credits, turn: int) -> Optional[Tuple[Tuple[int, ...], int, int, Credits]]:
+        '''
+        put the order on the lane that is free first, waiting for passive income or the rewards of the orders
+        already placed (credits, (submit turn, reward) sorted) if the ingredients are too expensive;
+        returns (lane times, submit turn, money afterwards, credits afterwards) or None if it can not be done in time
+        '''
+        start = lanes[0]
+        income = self.rules.money_per_turn
+        #money is kept relative to `turn` without the rewards, income over time is added when it is needed
+        i = bisect.bisect_right(credits, (start, float("inf")))
+        paid = sum(r for _, r in credits[:i])
+        while True:
+            short = c.cost - (cash + paid + (start - turn) * income)
+            if short <= 0:
+                break
+            next_credit = credits[i][0] if i < len(credits) else None
+            if income > 0 and (next_credit is None or start + -(-short // income) <= next_credit):
+                start += -(-short // income)
+                break
+            if next_credit is None:
+                return None
+            #wait for the next reward
+            start = next_credit
+            while i < len(credits) and credits[i][0] <= start:
+                paid += credits[i][1]
+                i += 1
+
+        done = max(start + c.duration, c.created_turn)
+        if done > c.expires_turn:
+            return None
+        new_lanes = tuple(sorted(lanes[1:] + (done,)))
+        new_credits = list(credits)
+        bisect.insort(new_credits, (done, c.reward))
+        return new_lanes, done, cash - c.cost, tuple(new_credits)
+
+    def evaluate(self, seq: List[Candidate], turn: int, money: int) -> Plan:
+        '''plan of a fixed sequence, orders that do not fit are skipped'''
+        lanes = (turn,) * self.lanes
+        credits: Credits = ()
+        p = Plan(complete=True)
+        for c in seq:
+            nxt = self.place(c, lanes, money, credits, turn)
+            if nxt is None:
+                continue
+            lanes, done, money, credits = nxt
+            p.sequence.append(c.order_id)
+            p.finish[c.order_id] = done
+            p.value += c.profit
+        return p
+
+    def greedy(self, cands: List[Candidate], turn: int, money: int) -> List[int]:
+        '''earliest deadline first over the candidates (which are sorted by profit rate)'''
+        return [c.order_id for c in sorted(cands, key=lambda c: c.expires_turn)]
@@ -0,0 +1,318 @@
+# recipe_dag.py
+"""
+Compiles an order's required foods into a DAG of bot tasks with estimated durations.
+
+    distances = StationDistances(map_copy)           #once, in BotPlayer.__init__
+    dag = compile_order(order["required"], distances)
+    dag.ready(done)                                  #tasks whose dependencies are all done
+    dag.makespan(num_bots)                           #estimated turns to finish with that many bots
+
+Per food the pipeline is:
+    buy -> [chop] -> [cook -> take] -> plate
+and a clean plate is bought and put on a counter (the assembly counter) before any food is plated.
+submit waits for every plate task.
+
+Every task has a `work` (turns a bot is busy: walking there plus the actions) and a `wait`
+(turns the task needs afterwards without a bot, only cooking has one). Chains of different foods
+are independent, so e.g. onions can be chopped while the meat cooks.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from game_constants import FoodType, Rules
+from map import Map
+
+
+UNREACHABLE = 10 ** 6
+
+
+# ----------------------------
+# Distances
+# ----------------------------
+
+class StationDistances:
+    '''
+    turns to bring an item between kinds of stations (by tile_name) on a map: bots walk with king moves,
+    use a station from any of the 8 tiles around it and can hand items over on counters
+    '''
+
+    def __init__(self, m: Map):
+        self.map = m
+        self.positions: Dict[str, List[Tuple[int, int]]] = {}
+        for x in range(m.width):
+            for y in range(m.height):
+                self.positions.setdefault(m.tiles[x][y].tile_name, []).append((x, y))
+
+        self.fields: Dict[Tuple[Any, bool], List[List[int]]] = {} #(tile_name or (x, y), handoff) -> turns from every tile
+        self.cache: Dict[Tuple[str, str], int] = {}
+
+    def access_tiles(self, x: int, y: int) -> List[Tuple[int, int]]:
+        '''walkable tiles a bot can use (x, y) from'''
+        m = self.map
+        return [
+            (x + dx, y + dy)
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            if m.is_tile_walkable(x + dx, y + dy)
+        ]
+
+    def field(self, tile_name: str, handoff: bool = True) -> List[List[int]]:
+        '''
+        turns from every tile to next to a station of that kind; with handoff an item can also cross a
+        counter between two walkable areas (a place and a pickup), without it only a walking bot counts
+        '''
+        key = (tile_name, handoff)
+        f = self.fields.get(key)
+        if f is None:
+            sources = [a for sx, sy in self.positions.get(tile_name, []) for a in self.access_tiles(sx, sy)]
+            f = self.search(sources, handoff)
+            self.fields[key] = f
+        return f
+
+    def field_at(self, x: int, y: int) -> List[List[int]]:
+        '''walking turns from every tile to next to the tile (x, y)'''
+        key = ((x, y), False)
+        f = self.fields.get(key)
+        if f is None:
+            f = self.search(self.access_tiles(x, y), False)
+            self.fields[key] = f
+        return f
+
+    def search(self, sources: List[Tuple[int, int]], handoff: bool) -> List[List[int]]:
+        '''Dijkstra from the source tiles over king moves (and counter handoffs)'''
+        m = self.map
+        f = [[UNREACHABLE] * m.height for _ in range(m.width)]
+        counters = [[UNREACHABLE] * m.height for _ in range(m.width)] #item left on the counter
+        heap: List[Tuple[int, int, int, bool]] = []
+        for ax, ay in sources:
+            if f[ax][ay] != 0:
+                f[ax][ay] = 0
+                heap.append((0, ax, ay, False))
+        heapq.heapify(heap)
+
+        while heap:
+            d, x, y, on_counter = heapq.heappop(heap)
+            if d > (counters if on_counter else f)[x][y]:
+                continue
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    nx, ny = x + dx, y + dy
+                    if not m.in_bounds(nx, ny):
+                        continue
+                    if m.is_tile_walkable(nx, ny):
+                        #walk a step, or pick the item up from the counter
+                        if f[nx][ny] > d + 1:
+                            f[nx][ny] = d + 1
+                            heapq.heappush(heap, (d + 1, nx, ny, False))
+                    elif handoff and not on_counter and m.tiles[nx][ny].tile_name == "COUNTER":
+                        #put the item down for a bot on the other side
+                        if counters[nx][ny] > d + 1:
+                            counters[nx][ny] = d + 1
+                            heapq.heappush(heap, (d + 1, nx, ny, True))
+        return f
+
+    def from_pos(self, x: int, y: int, tile_name: str) -> int:
+        '''walking turns for a bot standing on (x, y) to get next to the nearest station of that kind'''
+        if not self.map.in_bounds(x, y):
+            return UNREACHABLE
+        return self.field(tile_name, handoff=False)[x][y]
+
+    def walk(self, x: int, y: int, tx: int, ty: int) -> int:
+        '''walking turns for a bot standing on (x, y) to get next to the tile (tx, ty)'''
+        if not self.map.in_bounds(x, y) or not self.map.in_bounds(tx, ty):
+            return UNREACHABLE
+        return self.field_at(tx, ty)[x][y]
+
+    def travel(self, src: Optional[str], dst: str) -> int:
+        '''turns from next to the nearest src station to next to the nearest dst station, src None = already there'''
+        if src is None or src == dst:
+            return 0 if self.positions.get(dst) else UNREACHABLE
+
+        key = (src, dst)
+        d = self.cache.get(key)
+        if d is None:
+            f = self.field(dst)
+            d = min(
+                (f[ax][ay] for sx, sy in self.positions.get(src, []) for ax, ay in self.access_tiles(sx, sy)),
+                default=UNREACHABLE,
+            )
+            self.cache[key] = d
+        return d
+
+    def has(self, tile_name: str) -> bool:
+        return bool(self.positions.get(tile_name))
+
+
+# ----------------------------
+# Tasks
+# ----------------------------
+
+@dataclass
+class Task:
+    '''one step of a recipe, done by one bot at one kind of station'''
+    task_id: int
+    kind: str #"buy", "chop", "cook", "take", "buy_plate", "plate", "submit"
+    station: str #tile_name of the station it happens at
+    food: Optional[FoodType] = None
+    deps: List[int] = field(default_factory=list)
+    work: int = 1 #turns a bot is busy (walk + actions)
+    wait: int = 0 #turns without a bot before the dependents can start (cooking)
+    max_delay: Optional[int] = None #the next task must start within this many turns after the wait (burning)
+
+
+class TaskDAG:
+    '''tasks of one order in topological order (every task comes after its dependencies)'''
+
+    def __init__(self, tasks: List[Task], feasible: bool = True):
+        self.tasks = tasks
+        self.by_id = {t.task_id: t for t in tasks}
+        self.feasible = feasible #False if the map lacks a station the recipe needs
+
+        self.dependents: Dict[int, List[int]] = {t.task_id: [] for t in tasks}
+        for t in tasks:
+            for d in t.deps:
+                self.dependents[d].append(t.task_id)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def ready(self, done: Iterable[int], started: Iterable[int] = ()) -> List[Task]:
+        '''tasks that can start now: not done or started yet and every dependency done'''
+        done = set(done)
+        skip = done | set(started)
+        return [t for t in self.tasks if t.task_id not in skip and all(d in done for d in t.deps)]
+
+    def earliest_finish(self) -> Dict[int, int]:
+        '''finish turn (offset) of every task with unlimited bots'''
+        finish: Dict[int, int] = {}
+        for t in self.tasks:
+            start = max((finish[d] for d in t.deps), default=0)
+            finish[t.task_id] = start + t.work + t.wait
+        return finish
+
+    def critical_path(self) -> int:
+        '''turns to finish the order with unlimited bots'''
+        return max(self.earliest_finish().values(), default=0)
+
+    def remaining(self) -> Dict[int, int]:
+        '''longest path from the start of every task to the end of the order (list scheduling priority)'''
+        rem: Dict[int, int] = {}
+        for t in reversed(self.tasks):
+            rem[t.task_id] = t.work + t.wait + max((rem[d] for d in self.dependents[t.task_id]), default=0)
+        return rem
+
+    def total_work(self) -> int:
+        '''bot turns needed in total'''
+        return sum(t.work for t in self.tasks)
+
+    def makespan(self, num_bots: int, done: Iterable[int] = ()) -> int:
+        '''
+        estimated turns to finish the (rest of the) order with num_bots bots: list scheduling
+        by longest remaining path, stations are assumed free
+        '''
+        if not self.feasible:
+            return UNREACHABLE
+        done = set(done)
+        rem = self.remaining()
+        bots = [0] * max(1, num_bots) #turn each bot is free again
+        finish: Dict[int, int] = {d: 0 for d in done}
+
+        pending = [t for t in self.tasks if t.task_id not in done]
+        while pending:
+            ready = [t for t in pending if all(d in finish for d in t.deps)]
+            t = max(ready, key=lambda t: rem[t.task_id])
+            pending.remove(t)
+
+            b = min(range(len(bots)), key=bots.__getitem__)
+            start = max([bots[b]] + [finish[d] for d in t.deps])
+            bots[b] = start + t.work
+            finish[t.task_id] = start + t.work + t.wait
+
+        return max(finish.values(), default=0)
+
+
+# ----------------------------
+# Compiler
+# ----------------------------
+
+def to_food_type(food: Union[FoodType, str]) -> FoodType:
+    '''accepts FoodType members or their names (as in controller.get_orders())'''
+    return food if isinstance(food, FoodType) else FoodType[food]
+
+
+def compile_order(required: Sequence[Union[FoodType, str]], distances: Optional[StationDistances] = None, rules: Optional[Rules] = None) -> TaskDAG:
+    '''
+    builds the task DAG of an order; without distances only the actions and cooking are counted,
+    cooking times come from the rules (default Rules())
+    '''
+    if rules is None:
+        rules = Rules()
+    tasks: List[Task] = []
+    feasible = True
+
+    def travel(src: Optional[str], dst: str) -> int:
+        nonlocal feasible
+        if distances is None:
+            return 0
+        d = distances.travel(src, dst)
+        if d >= UNREACHABLE:
+            feasible = False
+            return 0
+        return d
+
+    def add(kind: str, station: str, food: Optional[FoodType], deps: List[int], work: int, wait: int = 0, max_delay: Optional[int] = None) -> int:
+        t = Task(len(tasks), kind, station, food, deps, work, wait, max_delay)
+        tasks.append(t)
+        return t.task_id
+
+    #the plate: buy it and put it on the assembly counter
+    plate = add("buy_plate", "COUNTER", None, [], travel("SHOP", "COUNTER") + 2) #buy + place
+
+    plated: List[int] = []
+    for food in map(to_food_type, required):
+        last = add("buy", "SHOP", food, [], 1)
+        at = "SHOP"
+
+        if food.can_chop:
+            last = add("chop", "COUNTER", food, [last], travel(at, "COUNTER") + 3) #place + chop + pickup
+            at = "COUNTER"
+
+        if food.can_cook:
+            cook = rules.cook_progress
+            burn = rules.burn_progress - rules.cook_progress
+            last = add("cook", "COOKER", food, [last], travel(at, "COOKER") + 1, wait=cook, max_delay=burn)
+            last = add("take", "COOKER", food, [last], 1)
+            at = "COOKER"
+
+        plated.append(add("plate", "COUNTER", food, [last, plate], travel(at, "COUNTER") + 1))
+
+    #pick the plate up, bring it over and submit
+    add("submit", "SUBMIT", None, plated or [plate], 1 + travel("COUNTER", "SUBMIT") + 1)
+
+    if distances is not None and not all(distances.has(t.station) for t in tasks):
+        feasible = False
+    return TaskDAG(tasks, feasible)
+
+
+class RecipeCompiler:
+    '''compile_order with the map's distances and a cache per distinct ingredient list'''
+
+    def __init__(self, m: Map, rules: Optional[Rules] = None):
+        self.distances = StationDistances(m)
+        self.rules = rules
+        self.cache: Dict[Tuple[str, ...], TaskDAG] = {}
+
+    def compile(self, required: Sequence[Union[FoodType, str]]) -> TaskDAG:
+        key = tuple(sorted(to_food_type(f).food_name for f in required))
+        dag = self.cache.get(key)
+        if dag is None:
+            dag = compile_order(key, self.distances, self.rules)
+            self.cache[key] = dag
+        return dag
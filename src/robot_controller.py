@@ -7,20 +7,25 @@ Rules enforced here:
 - Movement is single-step and must be within Chebyshev distance 1 (|dx|<=1, |dy|<=1).
 - All actions target a tile within Chebyshev distance 1 of the bot (including own tile).
 - Money is TEAM-SHARED (GameState.team_money[Team]).
+
+A trusted controller (RobotController(..., trusted=True), `game.py --trusted`) is for running your own bots
+against each other: getters hand out the live game objects instead of safety copies, which must only be
+read. The rules above are enforced the same way.
 """
 
 from __future__ import annotations
 
 import copy
 from collections import deque
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from game_constants import Team, FoodType, ShopCosts, GameConstants
+from game_constants import Team, FoodType, ShopCosts, GameConstants, Rules
 from map import Map
 from tiles import Tile, Counter, Sink, SinkTable, Cooker, Trash, Submit, Shop, Box
 from item import Item, Food, Plate, Pan
 
 from game_state import GameState
+from recipe_dag import UNREACHABLE
 
 from typing import Union
 
@@ -31,11 +36,18 @@ Buyable = Union[FoodType, ShopCosts]
 class RobotController:
     '''Class where robots can call the specified PUBLIC actions to alter game state'''
 
-    def __init__(self, team: Team, game_state: GameState):
+    def __init__(self, team: Team, game_state: GameState, verbose: bool = True, trusted: bool = False):
         self.__team = team
         self.__game_state = game_state
-
-        self.__last_seen_turn: int = game_state.turn #curr turn
+        self.__verbose = verbose #forward models run quietly
+        self.__trusted = trusted #hand out live references instead of copies, see the module docstring
+        self.__encoder = None #created by the first get_observation()
+        self.__views = None #created by the first bulk getter
+        self.__items = None #created by the first find_items()
+        self.__events_seen = game_state.events_end() #get_events() cursor
+        self.__sleep: Optional[Tuple[Optional[int], frozenset, int]] = None #sleep_until(): wake turn, event types, first event
+
+        self.__last_seen_turn: Tuple[int, int] = (game_state.turn, game_state.rollbacks) #curr turn
         self.__moves_left: Dict[int, int] = {}
         self.__actions_left: Dict[int, int] = {}
         self.__refresh_turn_budgets()
@@ -50,9 +62,10 @@ class RobotController:
             self.__actions_left[bot_id] = 1
 
     def __ensure_turn(self) -> None:
-        '''refresh with checks for turn state ie if new turn, add new movements'''
-        if self.__game_state.turn != self.__last_seen_turn:
-            self.__last_seen_turn = self.__game_state.turn
+        '''refresh with checks for turn state ie if new turn (or the state was rolled back), add new movements'''
+        seen = (self.__game_state.turn, self.__game_state.rollbacks)
+        if seen != self.__last_seen_turn:
+            self.__last_seen_turn = seen
             self.__refresh_turn_budgets()
 
     def __consume_move(self, bot_id: int) -> bool:
@@ -87,11 +100,17 @@ class RobotController:
     def get_team(self) -> Team:
         return self.__team
 
+    def get_rules(self) -> Rules:
+        '''cook/burn/wash times, money per turn, ... of this game (see game_constants.Rules)'''
+        return self.__game_state.rules
+
     def get_enemy_team(self) -> Team:
         return Team.RED if self.__team == Team.BLUE else Team.BLUE
 
     def get_map(self, team: Team) -> Map:
-        '''Deep copy for the user'''
+        '''Deep copy for the user (the live map, read only, when trusted)'''
+        if self.__trusted:
+            return self.__game_state.get_map(team)
         return copy.deepcopy(self.__game_state.get_map(team))
 
     def get_orders(self, team: Team) -> List[Dict[str, Any]]:
@@ -142,11 +161,143 @@ class RobotController:
         '''Get the tile at a specific x, y'''
         try:
             t = self.__game_state.get_tile(team, x, y)
-            return copy.deepcopy(t)
+            return t if self.__trusted else copy.deepcopy(t)
         
         except Exception:
             return None
 
+    def get_cooker_timings(self, team: Team) -> List[Dict[str, Any]]:
+        '''
+        every cooker on team's map in one call: x, y, has_pan, food_name, cooked_stage, cook_progress,
+        turns_until_cooked and turns_until_burnt (None for an empty pan). Cooking ticks at the start of a turn,
+        so food with turns_until_cooked == k can be taken out cooked on turn get_turn() + k
+        '''
+        return self.__game_state.cooker_timings(team)
+
+    def get_all_bot_states(self) -> Tuple[Any, ...]:
+        '''every bot (both teams) as BotView namedtuples by bot_id, see state_views.py'''
+        return self.__get_views().all_bots()
+
+    def get_station_states(self, team: Team) -> Tuple[Any, ...]:
+        '''every station on team's map (cookers, sinks, sink tables, boxes, counters) as TileView namedtuples'''
+        return self.__get_views().station_states(team)
+
+    def get_tiles(self, team: Team, positions: List[Tuple[int, int]]) -> List[Any]:
+        '''TileView namedtuple of every (x, y) in positions, None where out of bounds'''
+        return self.__get_views().tiles_at(team, positions)
+
+    def find_items(self, team: Team, kind: Any, near: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        '''
+        (x, y) of the tiles on team's map holding the kind, nearest to near first (see item_index.py):
+        a food name ("MEAT"), (food_name, chopped, cooked_stage), "PLATE", "DIRTY_PLATE" or "PAN"
+        '''
+        return self.__get_items().find(team, kind, near)
+
+    def find_stations(self, team: Team, what: Any, near: Optional[Tuple[int, int]] = None, k: Optional[int] = None) -> List[Tuple[int, int]]:
+        '''
+        (x, y) of up to k stations on team's map in that state, closest by walking from near first (see item_index.py):
+        "EMPTY_COUNTER", "EMPTY_BOX", "BOX", ("BOX", kind) or "CLEAN_PLATES" (sink tables)
+        '''
+        return self.__get_items().find_stations(team, what, near, k)
+
+    def __get_items(self):
+        if self.__items is None:
+            from item_index import ItemIndex
+            self.__items = ItemIndex(self.__game_state)
+        return self.__items
+
+    def __get_views(self):
+        if self.__views is None:
+            from state_views import StateViews
+            self.__views = StateViews(self.__game_state)
+        return self.__views
+
+    def get_forward_model(self):
+        '''
+        sandboxed copy of the current game for simulating ahead (see forward_model.py),
+        nothing done on it affects the real game
+        '''
+        from forward_model import ForwardModel #forward_model imports this module
+        return ForwardModel(self.__game_state.clone())
+
+    def get_observation(self) -> Dict[str, Any]:
+        '''
+        fixed-shape numpy arrays of the game from your team's point of view (see obs_encoder.py),
+        only what changed since your last call is re-encoded
+        '''
+        if self.__encoder is None:
+            from obs_encoder import ObservationEncoder #needs numpy, only imported when used
+            self.__encoder = ObservationEncoder(self.__game_state, self.__team)
+        obs = self.__encoder.encode()
+        if self.__trusted:
+            return obs #the encoder's own arrays, valid until the next call
+        return {key: arr.copy() for key, arr in obs.items()}
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        '''
+        what happened since your last call (call it once per turn), oldest first; every event is a dict with
+        "type", "turn", "team" (the map it happened on) and more keys depending on the type:
+            food_cooked, food_burnt: x, y (cooker), food_name
+            plate_washed: x, y (sink)
+            order_activated: order_id
+            order_expired: order_id, penalty
+            order_completed: order_id, reward, bot_id, by_team
+            team_switched, team_returned: switched_team
+            box_emptied: x, y
+            switch_window_opened
+        '''
+        gs = self.__game_state
+        events = gs.events_since(self.__events_seen)
+        if not self.__trusted:
+            events = [dict(e) for e in events]
+        self.__events_seen = gs.events_end()
+        return events
+
+    def sleep_until(self, turn: Optional[int] = None, events: Optional[List[str]] = None) -> bool:
+        '''
+        let the engine skip your play_turn until the turn (or later) or until an event of one of the types
+        (see get_events(), e.g. ["food_cooked", "order_activated"]) happens, whichever comes first;
+        only events on your own map or a map one of your bots is on wake you, the enemy's cookers and orders
+        on their map do not. move_to() goals keep walking meanwhile. False without a condition
+        '''
+        if turn is None and not events:
+            self.__warn("sleep_until() failed: needs a turn or event types")
+            return False
+        self.__sleep = (turn, frozenset(events or ()), self.__game_state.events_end())
+        return True
+
+    def is_asleep(self) -> bool:
+        '''whether the engine should skip this turn's play_turn, the sleep ends once its condition is met'''
+        if self.__sleep is None:
+            return False
+        turn, kinds, since = self.__sleep
+        gs = self.__game_state
+        if (turn is not None and gs.turn >= turn) or (kinds and self.__woken_by(kinds, gs.events_since(since))):
+            self.__sleep = None
+            return False
+        return True
+
+    def __woken_by(self, kinds: FrozenSet[str], events: List[Dict[str, Any]]) -> bool:
+        '''whether one of the events is of the kinds and happened on our map or a map our bots are on'''
+        gs = self.__game_state
+        maps = {self.__team.name}
+        maps.update(b.map_team.name for b in gs.bots.values() if b.team == self.__team)
+        return any(e["type"] in kinds and e["team"] in maps for e in events)
+
+    def idle_until(self) -> Optional[int]:
+        '''
+        for the engine's fast-forward: None if the team may act before the next turn (awake, or a bot walking a
+        move_to() goal), else the turn its sleep ends by itself (a very late turn for a sleep on events only)
+        '''
+        if self.__sleep is None:
+            return None
+        gs = self.__game_state
+        for bot_id, goal in gs.nav_goals.items():
+            if goal is not None and gs.bots[bot_id].team == self.__team:
+                return None
+        turn = self.__sleep[0]
+        return turn if turn is not None else 10 ** 9
+
     # ----------------------------
     # targeting helpers
     # ----------------------------
@@ -175,8 +326,16 @@ class RobotController:
             self.__warn(f"{label} failed : target ({target_x},{target_y}) is out of bounds")
             return None
 
-        tile = self.__game_state.get_tile(b.map_team, target_x, target_y)
-        return (target_x, target_y, tile)
+        #read only: queries and actions that fail their checks must not copy or touch anything
+        return (target_x, target_y, m.tiles[target_x][target_y])
+
+    def __target_for_write(self, b, target_x: int, target_y: int) -> Tile:
+        '''
+        the action passed its checks and changes the bot and the target tile: touch both and get the tile to
+        write to (copied if it is shared with a clone, so items of the tile read before are stale)
+        '''
+        self.__game_state.touch_bot(b.bot_id)
+        return self.__game_state.get_tile_for_write(b.map_team, target_x, target_y)
 
     # ----------------------------
     # Movement helpers
@@ -220,6 +379,73 @@ class RobotController:
         return True
 
 
+    def move_to(self, bot_id: int, target_x: int, target_y: int) -> bool:
+        '''
+        walk the bot next to (target_x, target_y) over the coming turns (see navigation.py): the engine moves it
+        one step along a shortest path after each of your turns unless it already moved; the step this turn is
+        taken right away. False if there is no way there
+        '''
+        b = self.__safe_get_bot(bot_id)
+        if b is None:
+            return False
+
+        gs = self.__game_state
+        if self.__get_navigator().distance(gs, b.map_team, b.x, b.y, target_x, target_y) >= UNREACHABLE:
+            self.__warn(f"move_to() failed: no way for bot {bot_id} to ({target_x},{target_y})")
+            return False
+
+        gs.set_key(gs.nav_goals, bot_id, (b.map_team, target_x, target_y))
+        self.__navigate(bot_id)
+        return True
+
+    def cancel_move_to(self, bot_id: int) -> None:
+        if self.__safe_get_bot(bot_id) is None:
+            return
+        gs = self.__game_state
+        if gs.nav_goals.get(bot_id) is not None:
+            gs.set_key(gs.nav_goals, bot_id, None)
+
+    def get_move_to(self, bot_id: int) -> Optional[Tuple[int, int]]:
+        '''the bot's move_to() target, None when it has none (or arrived)'''
+        goal = self.__game_state.nav_goals.get(bot_id)
+        return None if goal is None else (goal[1], goal[2])
+
+    def advance_navigation(self) -> None:
+        '''one step for every bot of the team with a move_to() goal that has not moved this turn, called by the engine'''
+        self.__ensure_turn()
+        for bot_id, goal in list(self.__game_state.nav_goals.items()):
+            if goal is not None and self.__moves_left.get(bot_id, 0) > 0:
+                self.__navigate(bot_id)
+
+    def __navigate(self, bot_id: int) -> None:
+        gs = self.__game_state
+        b = gs.bots.get(bot_id)
+        goal = gs.nav_goals.get(bot_id)
+        if b is None or goal is None or b.team != self.__team:
+            return
+
+        map_team, tx, ty = goal
+        nav = self.__get_navigator()
+        #switching maps or arriving ends the goal
+        if b.map_team != map_team or nav.distance(gs, map_team, b.x, b.y, tx, ty) == 0:
+            gs.set_key(gs.nav_goals, bot_id, None)
+            return
+
+        self.__ensure_turn()
+        if self.__moves_left.get(bot_id, 0) <= 0:
+            return
+        step = nav.next_step(gs, map_team, b.x, b.y, tx, ty)
+        if step is not None and self.move(bot_id, step[0], step[1]):
+            if nav.distance(gs, map_team, b.x, b.y, tx, ty) == 0:
+                gs.set_key(gs.nav_goals, bot_id, None)
+
+    def __get_navigator(self):
+        gs = self.__game_state
+        if gs.navigator is None:
+            from navigation import Navigator
+            gs.navigator = Navigator()
+        return gs.navigator
+
     # ----------------------------
     # botwise inventory interactions
     # ----------------------------
@@ -247,17 +473,21 @@ class RobotController:
         if isinstance(tile, Box):
             if getattr(tile, "count", 0) <= 0 or getattr(tile, "item", None) is None:
                 # enforce invariant
-                tile.count = 0
-                tile.item = None
+                if tile.count != 0 or tile.item is not None:
+                    tile = self.__game_state.get_tile_for_write(b.map_team, target_x, target_y)
+                    self.__set(tile, "count", 0)
+                    self.__set(tile, "item", None)
                 self.__warn(f"pickup() failed: BOX at ({target_x},{target_y}) is empty for bot {bot_id}")
                 return False
 
-            #give bot a new deepcopy of the stored prototype
-            b.holding = copy.deepcopy(tile.item)
-            tile.count -= 1
+            tile = self.__target_for_write(b, target_x, target_y)
+            #foods are interned and immutable so the bot gets the stored food itself, containers get a copy
+            self.__set(b, "holding", tile.item.copy())
+            self.__set(tile, "count", tile.count - 1)
             if tile.count <= 0:
-                tile.count = 0
-                tile.item = None
+                self.__set(tile, "count", 0)
+                self.__set(tile, "item", None)
+                self.__game_state.emit("box_emptied", b.map_team, x=target_x, y=target_y)
             return True
 
         item = getattr(tile, "item", None)
@@ -265,8 +495,10 @@ class RobotController:
             self.__warn(f"pickup() failed: nothing to pick up at ({target_x},{target_y}) for bot {bot_id}")
             return False
 
-        b.holding = item
-        tile.item = None
+        tile = self.__target_for_write(b, target_x, target_y)
+        item = tile.item
+        self.__set(b, "holding", item)
+        self.__set(tile, "item", None)
 
         return True
 
@@ -304,14 +536,16 @@ class RobotController:
                     return False
 
                 #else, just swap
-                tile.item = held_pan
-                b.holding = old_pan 
+                tile = self.__target_for_write(b, target_x, target_y)
+                old_pan = tile.item if isinstance(getattr(tile, "item", None), Pan) else None
+                self.__set(tile, "item", held_pan)
+                self.__set(b, "holding", old_pan)
 
                 #if the placed pan has food, then we start the cook
                 if isinstance(tile.item, Pan) and isinstance(tile.item.food, Food) and tile.item.food.can_cook:
-                    self.__set_cook_progress_for_food(tile, tile.item.food)
+                    self.__start_cook_for_food(b.map_team, target_x, target_y, tile.item.food)
                 else:
-                    tile.cook_progress = 0
+                    self.__game_state.stop_cooking(b.map_team, target_x, target_y)
 
                 return True
 
@@ -334,11 +568,13 @@ class RobotController:
                     return False
 
                 #move food from hand to pan
-                pan.food = b.holding
-                b.holding = None
+                tile = self.__target_for_write(b, target_x, target_y)
+                pan = tile.item
+                self.__set(pan, "food", b.holding)
+                self.__set(b, "holding", None)
 
                 #init cook progress based on teh food
-                self.__set_cook_progress_for_food(tile, pan.food)
+                self.__start_cook_for_food(b.map_team, target_x, target_y, pan.food)
                 return True
 
             #not the cases above, so fail
@@ -347,29 +583,32 @@ class RobotController:
 
         #BOX SPECIAL CASE HERE WHERE WE PLACE THE BOX
         if isinstance(tile, Box):
+            #non-empty means only accept same kind
+            if tile.count > 0 and tile.item is not None and tile.item is not b.holding and self.__item_signature(tile.item) != self.__item_signature(b.holding):
+                self.__warn(f"place() failed: box tile at ({target_x},{target_y}) stores a different item type")
+                return False
+
+            tile = self.__target_for_write(b, target_x, target_y)
             #enforce the invariant
-            tile.enforce_invar()
+            if tile.count <= 0:
+                self.__set(tile, "count", 0)
+                self.__set(tile, "item", None)
 
             #empty box means we accept anything
             if tile.count == 0:
-                tile.item = b.holding
-                tile.count = 1
-                b.holding = None
+                self.__set(tile, "item", b.holding)
+                self.__set(tile, "count", 1)
+                self.__set(b, "holding", None)
                 return True
 
-            #non-empty means only accept same kind
             if tile.item is None:
-                tile.item = b.holding
-                tile.count = 1
-                b.holding = None
+                self.__set(tile, "item", b.holding)
+                self.__set(tile, "count", 1)
+                self.__set(b, "holding", None)
                 return True
 
-            if self.__item_signature(tile.item) != self.__item_signature(b.holding):
-                self.__warn(f"place() failed: box tile at ({target_x},{target_y}) stores a different item type")
-                return False
-
-            tile.count += 1
-            b.holding = None
+            self.__set(tile, "count", tile.count + 1)
+            self.__set(b, "holding", None)
             return True
 
         if not hasattr(tile, "item"):
@@ -379,8 +618,9 @@ class RobotController:
             self.__warn(f"place() failed: tile at ({target_x},{target_y}) already has an item for bot {bot_id}")
             return False
 
-        tile.item = b.holding
-        b.holding = None
+        tile = self.__target_for_write(b, target_x, target_y)
+        self.__set(tile, "item", b.holding)
+        self.__set(b, "holding", None)
         return True
 
     def trash(self, bot_id: int, target_x: Optional[int] = None, target_y: Optional[int] = None) -> bool:
@@ -403,12 +643,17 @@ class RobotController:
             self.__warn(f"trash() failed: target ({target_x},{target_y}) is not trash tile for bot {bot_id}")
             return False
 
+        self.__game_state.touch_bot(bot_id)
+        #containers are emptied in place
         if isinstance(b.holding, Plate):
-            b.holding = Plate([], False)
+            if b.holding.food:
+                self.__set(b.holding, "food", [])
+                self.__set(b.holding, "contents", ())
+            self.__set(b.holding, "dirty", False)
         elif isinstance(b.holding, Pan):
-            b.holding = Pan(None) #empty pan
+            self.__set(b.holding, "food", None)
         else:
-            b.holding = None
+            self.__set(b, "holding", None)
         return True
 
     # ----------------------------
@@ -437,15 +682,15 @@ class RobotController:
             return False
 
         if isinstance(item, FoodType):
-            b.holding = Food(item)
+            self.__set(b, "holding", Food(item))
             return True
 
         if isinstance(item, ShopCosts):
             if item == ShopCosts.PLATE:
-                b.holding = Plate(food=[], dirty=False)
+                self.__set(b, "holding", Plate(food=[], dirty=False))
                 return True
             if item == ShopCosts.PAN:
-                b.holding = Pan(None)
+                self.__set(b, "holding", Pan(None))
                 return True
             self.__warn(f"buy() failed: no shop item {item}")
             return False
@@ -514,6 +759,7 @@ class RobotController:
             return False
 
         # spend money
+        self.__game_state.touch_bot(bot_id)
         self.__game_state.add_team_money(self.__team, -cost)
 
         # give the item to the bot
@@ -556,7 +802,8 @@ class RobotController:
             if not item.can_chop:
                 self.__warn(f"chop() failed: tile food not choppable bot {bot_id}")
                 return False
-            item.chopped = True
+            tile = self.__target_for_write(b, target_x, target_y)
+            self.__set(tile, "item", item.chop())
             return True
 
         self.__warn(f"chop() failed: nothing choppable at ({target_x},{target_y}) for bot {bot_id}")
@@ -616,16 +863,13 @@ class RobotController:
             self.__warn(f"start_cook() failed: bot={bot_id} must hold cookable food")
             return False
 
-        pan.food = b.holding
-        b.holding = None
+        tile = self.__target_for_write(b, target_x, target_y)
+        pan = tile.item
+        self.__set(pan, "food", b.holding)
+        self.__set(b, "holding", None)
 
         #when put the cook back on, start at the BEGINNING of the LAST stage
-        if pan.food.cooked_stage == 0:
-            tile.cook_progress = 0
-        elif pan.food.cooked_stage == 1:
-            tile.cook_progress = GameConstants.COOK_PROGRESS
-        else: 
-            tile.cook_progress = GameConstants.BURN_PROGRESS
+        self.__start_cook_for_food(b.map_team, target_x, target_y, pan.food)
 
         return True
 
@@ -655,9 +899,11 @@ class RobotController:
             return False
 
         #take the food and resest the pan
-        b.holding = pan.food
-        pan.food = None
-        tile.cook_progress = 0
+        tile = self.__target_for_write(b, target_x, target_y)
+        pan = tile.item
+        self.__set(b, "holding", pan.food)
+        self.__set(pan, "food", None)
+        self.__game_state.stop_cooking(b.map_team, target_x, target_y)
 
         return True
 
@@ -689,8 +935,9 @@ class RobotController:
             self.__warn(f"take_clean_plate() failed: no clean plates available for bot={bot_id}")
             return False
 
-        tile.num_clean_plates -= 1
-        b.holding = Plate(food=[], dirty=False)
+        tile = self.__target_for_write(b, target_x, target_y)
+        self.__set(tile, "num_clean_plates", tile.num_clean_plates - 1)
+        self.__set(b, "holding", Plate(food=[], dirty=False))
         return True
 
     def put_dirty_plate_in_sink(self, bot_id: int, target_x: Optional[int] = None, target_y: Optional[int] = None) -> bool:
@@ -715,8 +962,9 @@ class RobotController:
             return False
 
         #add dirty plate to sink
-        tile.num_dirty_plates += 1
-        b.holding = None
+        tile = self.__target_for_write(b, target_x, target_y)
+        self.__set(tile, "num_dirty_plates", tile.num_dirty_plates + 1)
+        self.__set(b, "holding", None)
         return True
 
     def wash_sink(self, bot_id: int, target_x: Optional[int] = None, target_y: Optional[int] = None) -> bool:
@@ -739,7 +987,8 @@ class RobotController:
             self.__warn(f"wash_sink(): no dirty plates to wash at ({target_x},{target_y}) bot {bot_id}")
             return False
 
-        tile.using = True
+        self.__target_for_write(b, target_x, target_y)
+        self.__game_state.start_washing(b.map_team, target_x, target_y)
         return True
 
     def add_food_to_plate(self, bot_id: int, target_x: Optional[int] = None, target_y: Optional[int] = None) -> bool:
@@ -761,9 +1010,11 @@ class RobotController:
                 self.__warn(f"add_food_to_plate() failed: plate is dirty for bot {bot_id}")
                 return False
             if isinstance(getattr(tile, "item", None), Food):
+                tile = self.__target_for_write(b, target_x, target_y)
                 food = tile.item
-                b.holding.food.append(food)
-                tile.item = None
+                self.__set(b.holding, "food", b.holding.food + [food])
+                self.__set(b.holding, "contents", b.holding.contents_with(food))
+                self.__set(tile, "item", None)
                 return True
             self.__warn(f"add_food_to_plate() failed: no food from target ({target_x},{target_y}) for bot {bot_id}")
             return False
@@ -774,10 +1025,12 @@ class RobotController:
             if plate.dirty:
                 self.__warn(f"add_food_to_plate() failed: target plate is dirty at ({target_x},{target_y}) bot {bot_id}")
                 return False
-            
 
-            plate.food.append(b.holding)
-            b.holding = None
+            tile = self.__target_for_write(b, target_x, target_y)
+            plate = tile.item
+            self.__set(plate, "food", plate.food + [b.holding])
+            self.__set(plate, "contents", plate.contents_with(b.holding))
+            self.__set(b, "holding", None)
             return True
 
         self.__warn(f"add_food_to_plate() failed: need a plate and food for bot {bot_id} targeting ({target_x},{target_y})")
@@ -892,19 +1145,13 @@ class RobotController:
     def __item_signature(self, it: Item) -> Tuple:
         '''defines "same item" in box logic; defined similarly for the submit logic in game state'''
 
-        #food signature
+        #foods are interned, the food itself is its signature
         if isinstance(it, Food):
-            return ("Food", it.food_name, bool(it.chopped), int(it.cooked_stage))
+            return it
 
         #plate signature with foods on top of it
         if isinstance(it, Plate):
-            foods = []
-            for f in it.food:
-                if isinstance(f, Food):
-                    foods.append((f.food_name, bool(f.chopped), int(f.cooked_stage)))
-                else:
-                    foods.append((type(f).__name__,))
-            return ("Plate", bool(it.dirty), tuple(foods))
+            return ("Plate", bool(it.dirty), tuple(it.food))
 
         #pan signature also by the foods
         if isinstance(it, Pan):
@@ -916,8 +1163,14 @@ class RobotController:
         return (type(it).__name__,)
 
 
+    def __set(self, obj: Any, name: str, value: Any) -> None:
+        '''every change goes through the game state so search can roll it back (GameState.set_attr)'''
+        self.__game_state.set_attr(obj, name, value)
+
     def __warn(self, msg: str) -> None:
         '''warn string'''
+        if not self.__verbose:
+            return
         print(f"[RC for {self.__team.name} WARN]: {msg}")
 
     def __can_move_internal(self, map_team: Team, x: int, y: int, dx: int, dy: int) -> bool:
@@ -938,17 +1191,18 @@ class RobotController:
         return True
 
 
-    def __set_cook_progress_for_food(self, cooker: Cooker, food: Food) -> None:
+    def __start_cook_for_food(self, map_team: Team, x: int, y: int, food: Food) -> None:
         '''
         internal helper that sets the colking progress for food when placed
         this is because this is used on two separate functions, modularity purposes
         '''
         if food.cooked_stage == 0:
-            cooker.cook_progress = 0
+            progress = 0
         elif food.cooked_stage == 1:
-            cooker.cook_progress = GameConstants.COOK_PROGRESS
+            progress = self.__game_state.rules.cook_progress
         else:
-            cooker.cook_progress = GameConstants.BURN_PROGRESS
+            progress = self.__game_state.rules.burn_progress
+        self.__game_state.start_cooking(map_team, x, y, progress)
 
 
 
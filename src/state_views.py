@@ -0,0 +1,144 @@
+# state_views.py
+"""
+Read-only snapshots of a GameState as namedtuples, behind RobotController's bulk getters.
+
+    controller.get_all_bot_states()               #(BotView, ...) of every bot, by bot_id
+    controller.get_station_states(team)           #(TileView, ...) of every station on team's map
+    controller.get_tiles(team, [(x, y), ...])     #TileView (None if out of bounds) per position
+
+Views are cached per tile and the GameState is watched (GameState.watch()), so after the first call
+only what was touched since the previous call is rebuilt. The tuples are immutable and can be kept.
+
+Items are nested tuples:
+    ("Food", food_name, chopped, cooked_stage)
+    ("Plate", dirty, (food, ...))
+    ("Pan", food or None)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from game_constants import Team
+from game_state import GameState
+from item import Item, Food, Plate, Pan
+
+
+class BotView(NamedTuple):
+    bot_id: int
+    team: str #original team
+    map_team: str #map the bot is on
+    x: int
+    y: int
+    holding: Optional[tuple]
+
+
+class TileView(NamedTuple):
+    x: int
+    y: int
+    tile_name: str
+    item: Optional[tuple] #for a box, the kind of item in it
+    count: int #items in a box
+    cook_progress: int
+    using: bool
+    num_dirty_plates: int
+    curr_dirty_plate_progress: int
+    num_clean_plates: int
+
+
+def item_view(it: Optional[Item]) -> Optional[tuple]:
+    if it is None:
+        return None
+    if isinstance(it, Food):
+        return ("Food", it.food_name, it.chopped, it.cooked_stage)
+    if isinstance(it, Plate):
+        return ("Plate", it.dirty, tuple(item_view(f) for f in it.food))
+    if isinstance(it, Pan):
+        return ("Pan", item_view(it.food))
+    return (type(it).__name__,)
+
+
+class StateViews:
+    '''cached views of one GameState, see the module docstring'''
+
+    def __init__(self, game_state: GameState):
+        self.game_state = game_state
+        self.changes = game_state.watch()
+        self.tiles: Dict[Tuple[Team, int, int], TileView] = {}
+        self.stations: Dict[Team, Tuple[TileView, ...]] = {}
+        self.bots: Optional[Tuple[BotView, ...]] = None
+        self.turn = game_state.turn
+
+    def close(self) -> None:
+        '''stop tracking changes of the game state'''
+        self.game_state.unwatch(self.changes)
+
+    def refresh(self) -> None:
+        '''drop the views of everything touched since the last call'''
+        cs = self.changes
+        if cs.full:
+            self.tiles.clear()
+            self.stations.clear()
+            self.bots = None
+        else:
+            for key in cs.tiles:
+                self.tiles.pop(key, None)
+                self.stations.pop(key[0], None)
+            if cs.bots:
+                self.bots = None
+            if self.turn != self.game_state.turn:
+                #cook progress follows the turn without the cooker being touched
+                for team in (Team.RED, Team.BLUE):
+                    for x, y in self.game_state.get_map(team).positions_of("COOKER"):
+                        self.tiles.pop((team, x, y), None)
+                    self.stations.pop(team, None)
+        self.turn = self.game_state.turn
+        cs.clear()
+
+    # ----------------------------
+    # Views
+    # ----------------------------
+
+    def all_bots(self) -> Tuple[BotView, ...]:
+        self.refresh()
+        if self.bots is None:
+            gs = self.game_state
+            self.bots = tuple(
+                BotView(b.bot_id, b.team.name, b.map_team.name, b.x, b.y, item_view(b.holding))
+                for _, b in sorted(gs.bots.items())
+            )
+        return self.bots
+
+    def station_states(self, team: Team) -> Tuple[TileView, ...]:
+        self.refresh()
+        views = self.stations.get(team)
+        if views is None:
+            views = tuple(self.tile(team, x, y) for x, y in self.game_state.get_map(team).station_positions())
+            self.stations[team] = views
+        return views
+
+    def tiles_at(self, team: Team, positions: Iterable[Tuple[int, int]]) -> List[Optional[TileView]]:
+        self.refresh()
+        m = self.game_state.get_map(team)
+        return [self.tile(team, x, y) if m.in_bounds(x, y) else None for x, y in positions]
+
+    def tile(self, team: Team, x: int, y: int) -> TileView:
+        '''cached view of an in-bounds tile (call refresh() first)'''
+        key = (team, x, y)
+        view = self.tiles.get(key)
+        if view is None:
+            t = self.game_state.get_map(team).tiles[x][y]
+            view = TileView(
+                x,
+                y,
+                t.tile_name,
+                item_view(t.item),
+                getattr(t, "count", 0),
+                getattr(t, "cook_progress", 0),
+                bool(t.using),
+                getattr(t, "num_dirty_plates", 0),
+                getattr(t, "curr_dirty_plate_progress", 0),
+                getattr(t, "num_clean_plates", 0),
+            )
+            self.tiles[key] = view
+        return view
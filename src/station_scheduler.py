@@ -0,0 +1,201 @@
+# station_scheduler.py
+"""
+Team-level reservations of shared stations (cookers, counters, sinks) over the coming turns.
+
+    scheduler = StationScheduler(map_copy, rules=controller.get_rules())     #in BotPlayer.__init__
+    r = scheduler.reserve_cook(owner=(order_id, task_id), earliest=turn + 3, near=(bx, by))
+    r.pos, r.start, r.ready_turn, r.burn_turn                               #where and when
+    scheduler.release(owner)                                                #when the food is taken out
+
+Every station keeps a sorted list of non-overlapping [start, end) reservations, so two bots never get
+the same cooker or counter at the same time. Cooking reservations last from placing the food until
+the last turn before it burns (the rules' cook_progress / burn_progress), so the pan is never
+asked for twice while something is in it.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from game_constants import Rules
+from map import Map
+from recipe_dag import StationDistances, UNREACHABLE
+
+
+SHARED_STATIONS = ("COOKER", "COUNTER", "SINK", "BOX")
+
+FOREVER = 10 ** 9
+
+
+@dataclass(eq=False)
+class Reservation:
+    owner: Hashable
+    kind: str #tile_name of the station
+    pos: Tuple[int, int]
+    start: int
+    end: int #exclusive
+    ready_turn: Optional[int] = None #cooking: food is cooked from this turn on
+    burn_turn: Optional[int] = None #cooking: food is burnt from this turn on
+
+
+class StationScheduler:
+    '''conflict-free time slots on the stations of one map, see the module docstring'''
+
+    def __init__(self, m: Map, distances: Optional[StationDistances] = None, rules: Optional[Rules] = None):
+        self.rules = rules if rules is not None else Rules()
+        self.distances = distances if distances is not None else StationDistances(m)
+        self.stations: Dict[str, List[Tuple[int, int]]] = {
+            kind: list(self.distances.positions.get(kind, [])) for kind in SHARED_STATIONS
+        }
+        self.timeline: Dict[Tuple[int, int], List[Reservation]] = {
+            pos: [] for positions in self.stations.values() for pos in positions
+        }
+        self.by_owner: Dict[Hashable, List[Reservation]] = {}
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def is_free(self, pos: Tuple[int, int], start: int, end: int) -> bool:
+        return all(r.end <= start or r.start >= end for r in self.timeline.get(pos, []))
+
+    def earliest_slot(self, pos: Tuple[int, int], earliest: int, duration: int) -> int:
+        '''first start >= earliest at which pos is free for duration turns'''
+        t = earliest
+        for r in self.timeline.get(pos, []):
+            if r.end <= t:
+                continue
+            if r.start >= t + duration:
+                break
+            t = r.end
+        return t
+
+    def reservations(self, owner: Hashable) -> List[Reservation]:
+        return list(self.by_owner.get(owner, []))
+
+    def find(self, kind: str, earliest: int, duration: int, near: Optional[Tuple[int, int]] = None) -> Optional[Tuple[Tuple[int, int], int]]:
+        '''
+        (station, start) of the kind that can be used first, counting the walk from `near`;
+        ties go to the closer station
+        '''
+        best: Optional[Tuple[Tuple[int, int], int]] = None
+        best_key: Optional[Tuple[int, int]] = None
+        for pos in self.stations.get(kind, []):
+            walk = 0
+            if near is not None:
+                walk = self.distances.walk(near[0], near[1], pos[0], pos[1])
+                if walk >= UNREACHABLE:
+                    continue
+            start = self.earliest_slot(pos, earliest + walk, duration)
+            key = (start, walk)
+            if best_key is None or key < best_key:
+                best, best_key = (pos, start), key
+        return best
+
+    # ----------------------------
+    # Reserving
+    # ----------------------------
+
+    def reserve(
+        self,
+        owner: Hashable,
+        kind: str,
+        earliest: int,
+        duration: int,
+        near: Optional[Tuple[int, int]] = None,
+        pos: Optional[Tuple[int, int]] = None,
+    ) -> Optional[Reservation]:
+        '''
+        book a station of the kind (or exactly pos) for duration turns as early as possible from earliest;
+        None if there is no such station (reachable from near)
+        '''
+        if pos is not None:
+            if pos not in self.timeline:
+                return None
+            start = self.earliest_slot(pos, earliest, duration)
+        else:
+            found = self.find(kind, earliest, duration, near)
+            if found is None:
+                return None
+            pos, start = found
+        return self.add(Reservation(owner, kind, pos, start, start + duration))
+
+    def reserve_cook(self, owner: Hashable, earliest: int, near: Optional[Tuple[int, int]] = None, cooked_stage: int = 0) -> Optional[Reservation]:
+        '''
+        book a cooker from placing raw (or already cooked) food until the turn before it burns,
+        the food has to be taken out between ready_turn and burn_turn
+        '''
+        #cooked food goes back in at the start of the last stage, like RobotController does
+        offset = self.rules.cook_progress if cooked_stage >= 1 else 0
+        r = self.reserve(owner, "COOKER", earliest, self.rules.burn_progress - offset, near)
+        if r is not None:
+            r.ready_turn = r.start + self.rules.cook_progress - offset
+            r.burn_turn = r.end
+        return r
+
+    def reserve_wash(self, owner: Hashable, earliest: int, plates: int = 1, near: Optional[Tuple[int, int]] = None) -> Optional[Reservation]:
+        '''book a sink for washing plates (a bot has to wash every turn)'''
+        return self.reserve(owner, "SINK", earliest, plates * self.rules.plate_wash_progress, near)
+
+    def block(self, pos: Tuple[int, int], start: int, end: int = FOREVER, owner: Hashable = None) -> List[Hashable]:
+        '''
+        mark a station busy because of something seen on the map (e.g. a pan someone else filled);
+        overlapping reservations are dropped, returns their owners so they can book again
+        '''
+        if pos not in self.timeline:
+            return []
+        dropped = [r for r in self.timeline[pos] if not (r.end <= start or r.start >= end)]
+        for r in dropped:
+            self.remove(r)
+        kind = next(kind for kind, positions in self.stations.items() if pos in positions)
+        self.add(Reservation(owner, kind, pos, start, end))
+        return [r.owner for r in dropped if r.owner != owner]
+
+    def shift(self, owner: Hashable, start: int) -> None:
+        '''move the owner's first reservation to `start` (the bot is late or early), or the first free slot after it'''
+        rs = self.by_owner.get(owner)
+        if not rs:
+            return
+        r = rs[0]
+        duration = r.end - r.start
+        self.remove(r)
+        if not self.is_free(r.pos, start, start + duration):
+            start = self.earliest_slot(r.pos, start, duration)
+        delta = start - r.start
+        r.start, r.end = start, start + duration
+        if r.ready_turn is not None:
+            r.ready_turn += delta
+        if r.burn_turn is not None:
+            r.burn_turn += delta
+        self.add(r)
+
+    def release(self, owner: Hashable) -> None:
+        '''drop every reservation of the owner (task done or abandoned)'''
+        for r in list(self.by_owner.get(owner, [])):
+            self.remove(r)
+
+    def prune(self, turn: int) -> None:
+        '''forget reservations that ended before this turn'''
+        for pos, rs in self.timeline.items():
+            while rs and rs[0].end <= turn:
+                self.remove(rs[0])
+
+    # ----------------------------
+    # Internal helpers
+    # ----------------------------
+
+    def add(self, r: Reservation) -> Reservation:
+        rs = self.timeline[r.pos]
+        bisect.insort(rs, r, key=lambda x: x.start)
+        self.by_owner.setdefault(r.owner, []).append(r)
+        return r
+
+    def remove(self, r: Reservation) -> None:
+        self.timeline[r.pos].remove(r)
+        rs = self.by_owner.get(r.owner)
+        if rs is not None:
+            rs.remove(r)
+            if not rs:
+                del self.by_owner[r.owner]
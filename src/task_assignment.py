@@ -0,0 +1,230 @@
+# task_assignment.py
+"""
+Assigns a team's bots to pending tasks by solving a min-cost matching every turn.
+
+    coordinator = TeamCoordinator(map_copy)                         #in BotPlayer.__init__
+    tasks = tasks_from_dag(dag, done, started, key=order_id)        #or any list of AssignTask
+    assignment = coordinator.assign({bot_id: (x, y), ...}, tasks)   #bot_id -> task key or None
+
+The cost of a bot doing a task is max(walking turns to the task's station, turns until the task
+is ready) minus its priority. The matching is the Hungarian algorithm (shortest augmenting paths with
+potentials, O(bots^2 * tasks)), warm started with the previous turn's task potentials and matching:
+pairs that are still optimal are kept and only the bots whose costs changed are matched again. A bot
+keeps its previous task unless switching saves more than `keep_bonus` turns.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from map import Map
+from recipe_dag import StationDistances, TaskDAG, UNREACHABLE
+
+
+INF = float("inf")
+TIGHT = 1e-9 #reduced costs up to this count as 0
+IDLE = object() #TeamCoordinator.matched entry of a bot that was given an idle column
+
+
+# ----------------------------
+# Matching
+# ----------------------------
+
+def hungarian(
+    cost: Sequence[Sequence[float]],
+    col_potentials: Optional[List[float]] = None,
+    warm_match: Optional[Sequence[Optional[int]]] = None,
+) -> Tuple[List[int], List[float]]:
+    '''
+    min-cost matching of every row to a distinct column (needs rows <= columns)
+
+    returns (column of each row, column potentials); feed both back in as a warm start when the next
+    matrix is similar: warm_match[i] is the column row i had (or None), the pairs that are still tight
+    under the potentials are kept and only the other rows are augmented
+    '''
+    return solve(cost, col_potentials, warm_match)
+
+
+def solve(
+    cost: Sequence[Sequence[float]],
+    col_potentials: Optional[List[float]],
+    warm_match: Optional[Sequence[Optional[int]]] = None,
+) -> Tuple[List[int], List[float]]:
+    '''shortest augmenting path Hungarian algorithm, see hungarian()'''
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n > m:
+        raise ValueError(f"hungarian() needs rows <= columns, got {n}x{m}")
+
+    #1-indexed, index 0 is the virtual start column
+    v = [0.0] + ([min(0.0, x) for x in col_potentials] if col_potentials is not None and len(col_potentials) == m else [0.0] * m)
+    u = [0.0] * (n + 1)
+    p = [0] * (m + 1) #row matched to each column
+    way = [0] * (m + 1)
+
+    if warm_match is not None and len(warm_match) == n:
+        for i, j in enumerate(warm_match):
+            if j is not None and 0 <= j < m and p[j + 1] == 0:
+                p[j + 1] = i + 1
+
+    #optimality needs c - u - v >= 0 everywhere, c - u - v == 0 on the matched pairs, v <= 0 and v == 0 on
+    #unmatched columns: zero the unmatched columns, give the rows the largest feasible u and drop the seeded
+    #pairs that are no longer tight, until nothing changes (without a warm match this is one pass)
+    while True:
+        for j in range(1, m + 1):
+            if not p[j]:
+                v[j] = 0.0
+        for i in range(1, n + 1):
+            row = cost[i - 1]
+            u[i] = min(row[j - 1] - v[j] for j in range(1, m + 1))
+        dropped = False
+        for j in range(1, m + 1):
+            i = p[j]
+            if i and cost[i - 1][j - 1] - u[i] - v[j] > TIGHT:
+                p[j] = 0
+                dropped = True
+        if not dropped:
+            break
+
+    matched = set(p[1:])
+    for i in range(1, n + 1):
+        if i in matched:
+            continue
+        p[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = INF
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - ui0 - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    match = [0] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            match[p[j] - 1] = j - 1
+    return match, v[1:]
+
+
+# ----------------------------
+# Team coordinator
+# ----------------------------
+
+@dataclass
+class AssignTask:
+    '''something one bot should go and do'''
+    key: Hashable
+    target: Union[str, Tuple[int, int]] #tile_name of a kind of station (nearest one counts) or a tile
+    ready_in: int = 0 #turns until it can be started (e.g. food still cooking)
+    priority: float = 0.0 #turns a bot may walk further for it
+
+
+def tasks_from_dag(dag: TaskDAG, done: Iterable[int], started: Iterable[int] = (), key: Hashable = None) -> List[AssignTask]:
+    '''ready tasks of an order's DAG, keyed (key, task_id); tasks on the critical path get priority'''
+    rem = dag.remaining()
+    return [AssignTask((key, t.task_id), t.station, 0, rem[t.task_id] / 10) for t in dag.ready(done, started)]
+
+
+class TeamCoordinator:
+    '''keeps the last assignment and potentials so the next turn's matching starts close to the answer'''
+
+    def __init__(self, m: Map, keep_bonus: float = 2.0, distances: Optional[StationDistances] = None):
+        self.distances = distances if distances is not None else StationDistances(m)
+        self.keep_bonus = keep_bonus
+        self.assignment: Dict[int, Hashable] = {}
+        self.matched: Dict[int, Hashable] = {} #bot_id -> task key or IDLE of the last matching, for the warm start
+        self.potentials: Dict[Hashable, float] = {}
+
+    def travel(self, pos: Tuple[int, int], task: AssignTask) -> int:
+        if isinstance(task.target, str):
+            return self.distances.from_pos(pos[0], pos[1], task.target)
+        return self.distances.walk(pos[0], pos[1], task.target[0], task.target[1])
+
+    def cost(self, bot_id: int, pos: Tuple[int, int], task: AssignTask) -> float:
+        d = self.travel(pos, task)
+        if d >= UNREACHABLE:
+            return INF
+        c = max(d, task.ready_in) - task.priority
+        if self.assignment.get(bot_id) == task.key:
+            c -= self.keep_bonus
+        return c
+
+    def assign(
+        self,
+        bots: Dict[int, Tuple[int, int]],
+        tasks: Sequence[AssignTask],
+        extra_cost: Optional[Callable[[int, AssignTask], float]] = None,
+    ) -> Dict[int, Optional[Hashable]]:
+        '''
+        bot_id -> key of its task, or None when there is nothing (reachable) for it;
+        extra_cost(bot_id, task) is added to the cost, INF forbids the pair (e.g. wrong item in hand)
+        '''
+        bot_ids = sorted(bots)
+        if not bot_ids:
+            self.assignment = {}
+            self.matched = {}
+            return {}
+
+        #an "idle" column per bot so everyone can be matched
+        big = 10.0 ** 6
+        cols: List[Optional[AssignTask]] = list(tasks) + [None] * len(bot_ids)
+        matrix: List[List[float]] = []
+        for bot_id in bot_ids:
+            row = []
+            for task in cols:
+                if task is None:
+                    row.append(big / 2) #idling is better than anything unreachable only
+                    continue
+                c = self.cost(bot_id, bots[bot_id], task)
+                if extra_cost is not None and c < INF:
+                    c += extra_cost(bot_id, task)
+                row.append(big if c == INF else c)
+            matrix.append(row)
+
+        warm = [self.potentials.get(t.key, 0.0) if t is not None else 0.0 for t in cols]
+        col_of = {t.key: j for j, t in enumerate(cols) if t is not None}
+        idle_cols = iter(range(len(tasks), len(cols)))
+        warm_match: List[Optional[int]] = []
+        for bot_id in bot_ids:
+            key = self.matched.get(bot_id)
+            warm_match.append(next(idle_cols) if key is IDLE else col_of.get(key) if key is not None else None)
+        match, v = hungarian(matrix, warm, warm_match)
+
+        self.potentials = {t.key: v[j] for j, t in enumerate(cols) if t is not None}
+        self.matched = {
+            bot_id: cols[match[r]].key if cols[match[r]] is not None else IDLE
+            for r, bot_id in enumerate(bot_ids)
+        }
+        result: Dict[int, Optional[Hashable]] = {}
+        for r, bot_id in enumerate(bot_ids):
+            task = cols[match[r]]
+            result[bot_id] = task.key if task is not None and matrix[r][match[r]] < big / 2 else None
+        self.assignment = {b: k for b, k in result.items() if k is not None}
+        return result
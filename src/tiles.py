@@ -5,17 +5,62 @@ from item import Item, Pan, Food, Plate
  
 '''Each class describes the current STATE of a tile. Robot controller describes how the state changes through bot actions'''
 
+def shares_type(tile_type: TileType):
+  '''class decorator: the tile type's data is kept once on the class instead of on every tile'''
+  def bind(cls):
+    cls.tile_type = tile_type
+    cls.tile_name = tile_type.tile_name
+    cls.tile_id = tile_type.tile_id
+    cls.is_walkable = tile_type.is_walkable
+    cls.is_dangerous = tile_type.is_dangerous
+    cls.is_placeable = tile_type.is_placeable
+    cls.is_interactable = tile_type.is_interactable
+    return cls
+  return bind
+
+
 class Tile:
-  def __init__(self, tile_type: TileType):
-    self.tile_name = tile_type.tile_name
-    self.tile_id = tile_type.tile_id
-    self.is_walkable = tile_type.is_walkable
-    self.is_dangerous = tile_type.is_dangerous
-    self.is_placeable = tile_type.is_placeable
-    self.is_interactable = tile_type.is_interactable
+  #stations keep per-tile state (cook progress, plates, ...) and are always copied when cloning,
+  #everything else only changes if an item is dropped on it so it can be shared between map copies
+  is_station = False
+  tile_type = None
+
+  #defaults until the first write: a floor or wall tile has no per-tile data at all
+  item = None #what item is on the tile
+  using = False #whether the tile is "in use" or not
+  owner = None #token of the map that can write this tile in place, see Map.tile_for_write
 
-    self.item = None #what item is on the tile
-    self.using = False #whether the tile is "in use" or not
+  def __init__(self, tile_type: TileType):
+    if type(self).tile_type is not tile_type:
+      #a plain Tile (or a subclass of another type) keeps its own copy
+      self.tile_type = tile_type
+      self.tile_name = tile_type.tile_name
+      self.tile_id = tile_type.tile_id
+      self.is_walkable = tile_type.is_walkable
+      self.is_dangerous = tile_type.is_dangerous
+      self.is_placeable = tile_type.is_placeable
+      self.is_interactable = tile_type.is_interactable
+
+  def copy(self) -> "Tile":
+    '''shallow copy of the tile with its own copy of the item'''
+    t = object.__new__(type(self))
+    t.__dict__.update(self.__dict__)
+    if self.item is not None:
+      t.item = self.item.copy()
+    return t
+
+  def signature(self) -> tuple:
+    '''hashable summary of everything that can change on this tile (used for state hashing)'''
+    return (
+        self.tile_id,
+        self.item.signature() if self.item is not None else None,
+        self.using,
+        getattr(self, "count", 0),
+        getattr(self, "cook_start", None), #cook progress is derived from it and the turn
+        getattr(self, "num_dirty_plates", 0),
+        getattr(self, "curr_dirty_plate_progress", 0),
+        getattr(self, "num_clean_plates", 0),
+    )
 
   def to_dict(self):
       '''basic JSON'''
@@ -29,29 +74,30 @@ class Placeable(Tile):
   '''
   Tiles that we can place objects on (ie counters)
   '''
-  def __init__(self, tile_type: TileType):
-    super().__init__(tile_type)
-    self.placeable = True
+  placeable = True
 
 class Interactable(Tile):
   '''Tiles that we can interact with (ie cooker)'''
-  def __init__(self, tile_type: TileType):
-    super().__init__(tile_type)
-    self.placeable = True
-    self.interactable = True
+  placeable = True
+  interactable = True
 
 
+@shares_type(TileType.FLOOR)
 class Floor(Tile):
     def __init__(self):
         super().__init__(TileType.FLOOR)
 
 
+@shares_type(TileType.WALL)
 class Wall(Tile):
     def __init__(self):
         super().__init__(TileType.WALL)
 
 
+@shares_type(TileType.COUNTER)
 class Counter(Interactable):
+   is_station = True
+
    def __init__(self):
         super().__init__(TileType.COUNTER)
         self.item = None #only 1 item can be on a counter, None = no item on counter 
@@ -61,7 +107,10 @@ class Counter(Interactable):
        d["item"] = self.item.to_dict() if self.item else None #add item if avail to the tile
        return d
 
+@shares_type(TileType.BOX)
 class Box(Interactable):
+    is_station = True
+
     def __init__(self):
         super().__init__(TileType.BOX)
         self.item = None #this is the item to put in that needs to match
@@ -78,7 +127,10 @@ class Box(Interactable):
        d["count"] = self.count #add count inside the box
        return d
 
+@shares_type(TileType.SINK)
 class Sink(Interactable):
+    is_station = True
+
     def __init__(self):
         super().__init__(TileType.SINK)
         self.num_dirty_plates = 0
@@ -91,7 +143,10 @@ class Sink(Interactable):
        d["using"] = self.using
        return d
 
+@shares_type(TileType.SINKTABLE)
 class SinkTable(Interactable):
+    is_station = True
+
     def __init__(self):
         super().__init__(TileType.SINKTABLE)
         self.num_clean_plates = 0 #user can take clean plates
@@ -101,11 +156,27 @@ class SinkTable(Interactable):
        d["num_clean_plates"] = self.num_clean_plates
        return d
 
+class TurnClock:
+    '''the current turn, shared by a GameState and its cookers so cook progress can be derived on read'''
+    def __init__(self, turn: int = 0):
+        self.turn = turn
+
+@shares_type(TileType.COOKER)
 class Cooker(Interactable):
+    is_station = True
+
     def __init__(self):
         super().__init__(TileType.COOKER)
         self.item = Pan() #empty pan
-        self.cook_progress = 0 #ticks every turn
+        self.cook_start = None #turn at which cook_progress was 0, None = nothing cooking
+        self.clock = None #TurnClock of the game, bound by GameState
+
+    @property
+    def cook_progress(self) -> int:
+        '''ticks every turn while food is in the pan'''
+        if self.cook_start is None or self.clock is None:
+            return 0
+        return self.clock.turn - self.cook_start
 
     def to_dict(self):
        d = super().to_dict()
@@ -113,24 +184,23 @@ class Cooker(Interactable):
        d["cook_progress"] = self.cook_progress
        return d
 
+@shares_type(TileType.TRASH)
 class Trash(Interactable):
     def __init__(self):
         super().__init__(TileType.TRASH)
 
+@shares_type(TileType.SUBMIT)
 class Submit(Interactable):
     def __init__(self):
         super().__init__(TileType.SUBMIT)
         
+@shares_type(TileType.SHOP)
 class Shop(Interactable):
+    #default is allow every food and shop item (shared by every shop, give a shop its own set to change it)
+    shop_items = frozenset(list(FoodType) + list(ShopCosts))
+
     def __init__(self):
         super().__init__(TileType.SHOP)
-        self.shop_items = set()
-
-        #default is allow every food and shop item
-        for food in FoodType:
-            self.shop_items.add(food)
-        for shop_item in ShopCosts:
-            self.shop_items.add(shop_item)
     
     def to_dict(self):
        d = super().to_dict()
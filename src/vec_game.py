@@ -0,0 +1,318 @@
+# vec_game.py
+"""
+Vectorized self-play environment: N games on the same map stepped in lockstep.
+
+Every environment is a GameState.clone() of one loaded map, stepped with the same rules as the
+real game (see forward_model.step). Actions come in as one int array for all games and all bots:
+
+    actions[env, bot] = (move, interaction, target)
+
+    move         index into DIRECTIONS, 0 = stay
+    interaction  index into INTERACTIONS, 0 = nothing
+    target       index into DIRECTIONS, offset of the targeted tile from the bot (after its move)
+
+Bots are ordered by bot_id (see VecGame.bot_ids), both teams are controlled so a policy plays itself.
+Games that reach the turn limit are reset automatically; the observation returned for them is
+already the first one of the next game.
+
+Observations are obs_encoder.ObservationEncoder's arrays of both teams' points of view, stacked:
+
+    obs[key][env, team.value]       key in "planes", "bots", "orders", "scalars"
+
+with one incrementally updated encoder per environment and team, writing straight into its rows of the
+batch and re-attached when the game resets.
+
+Needs numpy (requirements.txt).
+
+Benchmark:
+    python src/vec_game.py --map maps/map1.txt --envs 64
+    python src/vec_game.py --map maps/map1.txt --envs 64 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game_constants import Team, FoodType, ShopCosts
+from game_state import GameState
+from obs_encoder import ObservationEncoder
+from robot_controller import RobotController
+
+
+DIRECTIONS: List[Tuple[int, int]] = [(0, 0), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+#(controller method, extra arguments before the target), None = do nothing
+INTERACTIONS: List[Optional[Tuple[Any, ...]]] = (
+    [
+        None,
+        ("pickup",),
+        ("place",),
+        ("trash",),
+        ("chop",),
+        ("start_cook",),
+        ("take_from_pan",),
+        ("take_clean_plate",),
+        ("put_dirty_plate_in_sink",),
+        ("wash_sink",),
+        ("add_food_to_plate",),
+        ("submit",),
+        ("switch_maps",),
+    ]
+    + [("buy", ft) for ft in FoodType]
+    + [("buy", sc) for sc in ShopCosts]
+)
+
+
+def apply_bot_actions(controller: RobotController, game_state: GameState, bot_ids: List[int], actions: List[List[int]]) -> None:
+    '''apply the (move, interaction, target) rows of the controller's team, the target is relative to where the bot ends up'''
+    for bot_id, (move, interaction, target) in zip(bot_ids, actions):
+        if move:
+            dx, dy = DIRECTIONS[move]
+            controller.move(bot_id, dx, dy)
+
+        spec = INTERACTIONS[interaction]
+        if spec is None:
+            continue
+        if spec[0] == "switch_maps":
+            controller.switch_maps()
+            continue
+
+        b = game_state.bots[bot_id]
+        tx, ty = DIRECTIONS[target]
+        getattr(controller, spec[0])(bot_id, *spec[1:], b.x + tx, b.y + ty)
+
+
+class VecGame:
+    '''N games over the same map in one process, see the module docstring for the action layout'''
+
+    def __init__(self, map_path: str, num_envs: int, turn_limit: Optional[int] = None):
+        from map_processor import load_game_state
+
+        self.map_path = map_path
+        self.num_envs = num_envs
+
+        self.root, _ = load_game_state(map_path)
+        self.turn_limit = turn_limit if turn_limit is not None else self.root.rules.total_turns
+        self.bot_ids = sorted(self.root.bots)
+        self.red_rows = [r for r, bot_id in enumerate(self.bot_ids) if self.root.bots[bot_id].team == Team.RED]
+        self.blue_rows = [r for r, bot_id in enumerate(self.bot_ids) if self.root.bots[bot_id].team == Team.BLUE]
+        self.red_ids = [self.bot_ids[r] for r in self.red_rows]
+        self.blue_ids = [self.bot_ids[r] for r in self.blue_rows]
+        self.width = self.root.red_map.width
+        self.height = self.root.red_map.height
+
+        self.states: List[GameState] = [None] * num_envs # type: ignore
+        self.controllers: List[Tuple[RobotController, RobotController]] = [None] * num_envs # type: ignore
+        self.encoders: List[Tuple[ObservationEncoder, ObservationEncoder]] = [None] * num_envs # type: ignore
+
+        #observation buffers in the encoders' layout, overwritten in place by every reset() / step()
+        sample = ObservationEncoder(self.root, Team.RED, turn_limit=self.turn_limit)
+        self.obs: Dict[str, np.ndarray] = {
+            key: np.zeros((num_envs, 2) + arr.shape, dtype=arr.dtype) for key, arr in sample.encode().items()
+        }
+        sample.close()
+        self.rewards = np.zeros((num_envs, 2), dtype=np.float32)
+        self.dones = np.zeros((num_envs,), dtype=bool)
+
+    @property
+    def action_shape(self) -> Tuple[int, int, int]:
+        return (self.num_envs, len(self.bot_ids), 3)
+
+    def reset_env(self, i: int) -> None:
+        '''start game i over from the map's first turn'''
+        gs = self.root.clone()
+        self.states[i] = gs
+        self.controllers[i] = (
+            RobotController(Team.RED, gs, verbose=False),
+            RobotController(Team.BLUE, gs, verbose=False),
+        )
+        if self.encoders[i] is None:
+            self.encoders[i] = tuple(
+                ObservationEncoder(gs, team, turn_limit=self.turn_limit, buffers={key: arr[i, team.value] for key, arr in self.obs.items()})
+                for team in (Team.RED, Team.BLUE)
+            )
+        else:
+            for enc in self.encoders[i]:
+                enc.attach(gs)
+        self.write_obs(i)
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        for i in range(self.num_envs):
+            self.reset_env(i)
+        return self.obs
+
+    def write_obs(self, i: int) -> None:
+        '''bring row i of the observation buffers up to date with game i (only what changed is re-encoded)'''
+        for enc in self.encoders[i]:
+            enc.encode()
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        '''
+        advance every game by one turn
+
+        returns (obs, rewards, dones, infos): rewards are each team's money gained this turn (num_envs, 2),
+        finished games carry {"final_money": (red, blue)} in their info and are already reset
+        '''
+        actions = np.asarray(actions)
+        if actions.shape != self.action_shape:
+            raise ValueError(f"actions must have shape {self.action_shape}, got {actions.shape}")
+
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        for i in range(self.num_envs):
+            gs = self.states[i]
+            red_controller, blue_controller = self.controllers[i]
+            before = (gs.team_money[Team.RED], gs.team_money[Team.BLUE])
+
+            #same order as the real game: environment first, then blue's bots, then red's
+            gs.start_turn()
+            rows = actions[i].tolist()
+            apply_bot_actions(blue_controller, gs, self.blue_ids, [rows[r] for r in self.blue_rows])
+            apply_bot_actions(red_controller, gs, self.red_ids, [rows[r] for r in self.red_rows])
+
+            after = (gs.team_money[Team.RED], gs.team_money[Team.BLUE])
+            self.rewards[i] = (after[0] - before[0], after[1] - before[1])
+
+            done = gs.turn >= self.turn_limit
+            self.dones[i] = done
+            if done:
+                infos[i]["final_money"] = after
+                self.reset_env(i)
+            else:
+                self.write_obs(i)
+
+        return self.obs, self.rewards, self.dones, infos
+
+    def close(self) -> None:
+        for encoders in self.encoders:
+            for enc in encoders or ():
+                enc.close()
+
+
+# ----------------------------
+# Process pool backend
+# ----------------------------
+
+def worker(conn, map_path: str, num_envs: int, turn_limit: Optional[int]) -> None:
+    '''runs a VecGame for a slice of the environments in a child process'''
+    env = VecGame(map_path, num_envs, turn_limit)
+    try:
+        while True:
+            cmd, data = conn.recv()
+            if cmd == "step":
+                conn.send(env.step(data))
+            elif cmd == "reset":
+                conn.send(env.reset())
+            elif cmd == "close":
+                break
+    finally:
+        conn.close()
+
+
+class SubprocVecGame:
+    '''same interface as VecGame, with the environments split over worker processes'''
+
+    def __init__(self, map_path: str, num_envs: int, num_workers: int, turn_limit: Optional[int] = None):
+        from map_processor import load_game_state
+
+        num_workers = max(1, min(num_workers, num_envs))
+        self.num_envs = num_envs
+        self.bot_ids = sorted(load_game_state(map_path)[0].bots)
+
+        #contiguous slices of the environments, as even as possible
+        sizes = [num_envs // num_workers + (1 if w < num_envs % num_workers else 0) for w in range(num_workers)]
+        self.bounds = np.cumsum([0] + sizes)
+
+        self.conns = []
+        self.procs = []
+        for size in sizes:
+            parent, child = mp.Pipe()
+            p = mp.Process(target=worker, args=(child, map_path, size, turn_limit), daemon=True)
+            p.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(p)
+
+    @property
+    def action_shape(self) -> Tuple[int, int, int]:
+        return (self.num_envs, len(self.bot_ids), 3)
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        for conn in self.conns:
+            conn.send(("reset", None))
+        return self.concat_obs([conn.recv() for conn in self.conns])
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        actions = np.asarray(actions)
+        if actions.shape != self.action_shape:
+            raise ValueError(f"actions must have shape {self.action_shape}, got {actions.shape}")
+
+        for w, conn in enumerate(self.conns):
+            conn.send(("step", actions[self.bounds[w]:self.bounds[w + 1]]))
+        results = [conn.recv() for conn in self.conns]
+
+        obs = self.concat_obs([r[0] for r in results])
+        rewards = np.concatenate([r[1] for r in results])
+        dones = np.concatenate([r[2] for r in results])
+        infos = [info for r in results for info in r[3]]
+        return obs, rewards, dones, infos
+
+    @staticmethod
+    def concat_obs(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def close(self) -> None:
+        for conn in self.conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for p in self.procs:
+            p.join(timeout=1.0)
+
+
+def make_vec_game(map_path: str, num_envs: int, num_workers: int = 0, turn_limit: Optional[int] = None):
+    '''VecGame in this process, or SubprocVecGame when num_workers > 0'''
+    if num_workers > 0:
+        return SubprocVecGame(map_path, num_envs, num_workers, turn_limit)
+    return VecGame(map_path, num_envs, turn_limit)
+
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+
+def main():
+    '''measures environment steps per second with random actions'''
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--map", default="maps/map1.txt", help="path to map text file")
+    ap.add_argument("--envs", type=int, default=64, help="number of games stepped together")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes, 0 = step in this process")
+    ap.add_argument("--steps", type=int, default=200, help="number of batched steps")
+    ap.add_argument("--turns", type=int, default=None, help="turn limit per game (default: the map's rules)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    env = make_vec_game(args.map, args.envs, args.workers, args.turns)
+    rng = np.random.default_rng(args.seed)
+    highs = np.array([len(DIRECTIONS), len(INTERACTIONS), len(DIRECTIONS)])
+
+    try:
+        env.reset()
+        t0 = time.perf_counter()
+        for _ in range(args.steps):
+            env.step(rng.integers(0, highs, size=env.action_shape))
+        dt = time.perf_counter() - t0
+    finally:
+        env.close()
+
+    n = args.steps * args.envs
+    print(f"[BENCH] {args.map}: {n} env steps ({args.envs} envs, {args.workers} workers) in {dt:.3f}s -> {n / dt:.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+#the engine modules import each other by name from src/
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+MAPS = os.path.join(os.path.dirname(SRC), "maps")
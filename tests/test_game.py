@@ -0,0 +1,39 @@
+import os
+
+from conftest import MAPS
+from game import Game
+from game_constants import Team
+
+HANGING_BOT = """
+class BotPlayer:
+    def __init__(self, m):
+        self.turns = 0
+
+    def play_turn(self, controller):
+        self.turns += 1
+        while self.turns == 2:
+            try:
+                pass
+            except Exception:
+                pass
+"""
+
+IDLE_BOT = """
+class BotPlayer:
+    def __init__(self, m):
+        pass
+
+    def play_turn(self, controller):
+        pass
+"""
+
+
+def test_trusted_mode_keeps_the_turn_time_limit(tmp_path):
+    red = tmp_path / "hang.py"
+    red.write_text(HANGING_BOT)
+    blue = tmp_path / "idle.py"
+    blue.write_text(IDLE_BOT)
+
+    game = Game(str(red), str(blue), os.path.join(MAPS, "map1.txt"), turn_limit=10, per_turn_timeout_s=0.1, trusted=True)
+    assert game.run_game() == Team.BLUE
+    assert game.game_state.turn == 2
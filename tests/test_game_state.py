@@ -0,0 +1,59 @@
+import os
+import random
+
+import pytest
+
+from conftest import MAPS
+from game_constants import Team, FoodType
+from forward_model import ForwardModel
+from map_processor import load_game_state
+
+
+TILE_ACTIONS = ["pickup", "place", "trash", "chop", "start_cook", "take_from_pan", "take_clean_plate",
+                "put_dirty_plate_in_sink", "wash_sink", "add_food_to_plate", "submit"]
+
+
+def random_actions(gs, team, rng):
+    '''a random step and a random buy or tile action next to every bot of the team'''
+    out = []
+    for bot_id, b in gs.bots.items():
+        if b.team != team:
+            continue
+        out.append(("move", bot_id, rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))))
+        x, y = b.x + rng.choice((-1, 0, 1)), b.y + rng.choice((-1, 0, 1))
+        r = rng.random()
+        if r < 0.3:
+            out.append(("buy", bot_id, rng.choice(list(FoodType)), x, y))
+        elif r < 0.9:
+            out.append((rng.choice(TILE_ACTIONS), bot_id, x, y))
+    return out
+
+
+def snapshot(gs):
+    tiles = tuple(
+        gs.get_map(team).tiles[x][y].signature()
+        for team in (Team.RED, Team.BLUE)
+        for x in range(gs.red_map.width)
+        for y in range(gs.red_map.height)
+    )
+    orders = tuple((o.order_id, o.claimed_by, o.completed_turn, o.penalized) for os_ in gs.orders.values() for o in os_)
+    bots = tuple((b.x, b.y, b.map_team, b.holding.signature() if b.holding else None) for b in gs.bots.values())
+    return gs.turn, tiles, orders, bots, tuple(sorted((t.name, v) for t, v in gs.team_money.items()))
+
+
+@pytest.mark.parametrize("map_name", ["map1.txt", "orbit.txt", "throughput.txt"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_rollback_leaves_clone_alone(map_name, seed):
+    '''a clone taken inside a checkpoint keeps its state when the original rolls back'''
+    rng = random.Random(seed)
+    gs, _ = load_game_state(os.path.join(MAPS, map_name))
+    fm = ForwardModel(gs)
+    for _ in range(150):
+        gs.push_checkpoint()
+        for _ in range(rng.randint(1, 4)):
+            fm.step(random_actions(gs, Team.RED, rng), random_actions(gs, Team.BLUE, rng))
+        clone = gs.clone()
+        before = snapshot(clone)
+        gs.rollback()
+        assert snapshot(clone) == before
+        fm.step(random_actions(gs, Team.RED, rng), random_actions(gs, Team.BLUE, rng))
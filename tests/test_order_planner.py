@@ -0,0 +1,27 @@
+import os
+
+from conftest import MAPS
+from game_constants import Rules
+from map_processor import load_game_state
+from order_planner import OrderPlanner
+
+
+def order(order_id, required, reward):
+    return {"order_id": order_id, "required": required, "created_turn": 0, "expires_turn": 100,
+            "reward": reward, "penalty": 0, "completed_turn": None}
+
+
+def test_rewards_are_spent_only_after_the_order_is_submitted():
+    '''with two lanes and no income, B's ingredients can only be bought with A's reward once A is done'''
+    gs, _ = load_game_state(os.path.join(MAPS, "map1.txt"))
+    planner = OrderPlanner(gs.red_map, num_bots=2, lanes=2, rules=Rules().override(money_per_turn=0))
+    orders = [order(1, ["SAUCE"], 60), order(2, ["NOODLES"], 100)] #cost 12 and 42 with the plate
+
+    plan = planner.plan(orders, turn=0, money=12, durations={1: 10, 2: 5})
+    assert sorted(plan.sequence) == [1, 2]
+    assert plan.finish[1] == 10
+    assert plan.finish[2] >= plan.finish[1] + 5
+
+    by_id = {c.order_id: c for c in planner.candidates(orders, 0, {1: 10, 2: 5})}
+    fixed = planner.evaluate([by_id[1], by_id[2]], 0, 12)
+    assert fixed.finish == {1: 10, 2: 15}
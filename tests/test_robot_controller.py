@@ -0,0 +1,29 @@
+import os
+
+from conftest import MAPS
+from game_constants import Team
+from map_processor import load_game_state
+from robot_controller import RobotController
+
+
+def test_sleep_ignores_events_on_the_enemy_map():
+    gs, _ = load_game_state(os.path.join(MAPS, "map1.txt"))
+    red = RobotController(Team.RED, gs, verbose=False)
+
+    red.sleep_until(events=["food_cooked"])
+    gs.emit("food_cooked", Team.BLUE, x=0, y=0, food_name="MEAT")
+    assert red.is_asleep()
+
+    gs.emit("food_cooked", Team.RED, x=0, y=0, food_name="MEAT")
+    assert not red.is_asleep()
+
+
+def test_sleep_wakes_on_events_where_a_bot_is():
+    gs, _ = load_game_state(os.path.join(MAPS, "map1.txt"))
+    red = RobotController(Team.RED, gs, verbose=False)
+    bot = next(b for b in gs.bots.values() if b.team == Team.RED)
+    bot.map_team = Team.BLUE
+
+    red.sleep_until(events=["food_cooked"])
+    gs.emit("food_cooked", Team.BLUE, x=0, y=0, food_name="MEAT")
+    assert not red.is_asleep()
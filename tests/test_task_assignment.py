@@ -0,0 +1,69 @@
+import itertools
+import os
+import random
+
+from conftest import MAPS
+from map_processor import load_game_state
+from task_assignment import AssignTask, TeamCoordinator, hungarian
+
+
+def total(cost, match):
+    return sum(cost[i][j] for i, j in enumerate(match))
+
+
+def best_total(cost):
+    n, m = len(cost), len(cost[0])
+    return min(sum(cost[i][p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+
+
+def test_warm_start_equals_cold_solve_on_a_changed_matrix():
+    rng = random.Random(0)
+    for _ in range(500):
+        n = rng.randint(1, 4)
+        m = rng.randint(n, 6)
+        cost = [[rng.randint(0, 20) for _ in range(m)] for _ in range(n)]
+        match, v = hungarian(cost)
+        assert total(cost, match) == best_total(cost)
+
+        changed = [row[:] for row in cost]
+        for _ in range(rng.randint(1, 3)):
+            changed[rng.randrange(n)][rng.randrange(m)] = rng.randint(0, 20)
+        warm, _ = hungarian(changed, v, match)
+        cold, _ = hungarian(changed)
+        assert len(set(warm)) == n
+        assert total(changed, warm) == total(changed, cold) == best_total(changed)
+
+
+def test_warm_start_keeps_the_matching_of_an_unchanged_matrix():
+    rng = random.Random(1)
+    cost = [[rng.randint(0, 20) for _ in range(8)] for _ in range(5)]
+    match, v = hungarian(cost)
+    assert hungarian(cost, v, match)[0] == match
+
+
+def test_coordinator_matches_a_cold_coordinator_over_turns():
+    gs, _ = load_game_state(os.path.join(MAPS, "map1.txt"))
+    m = gs.red_map
+    floor = [(x, y) for x in range(m.width) for y in range(m.height) if m.is_tile_walkable(x, y)]
+    stations = [(x, y) for x, y in m.station_positions()]
+    rng = random.Random(2)
+
+    warm = TeamCoordinator(m)
+    bots = {bot_id: rng.choice(floor) for bot_id in range(4)}
+    for _ in range(30):
+        tasks = [AssignTask(("t", k), rng.choice(stations), rng.randint(0, 5)) for k in rng.sample(range(12), 6)]
+        cold = TeamCoordinator(m, distances=warm.distances)
+        cold.assignment = dict(warm.assignment)
+        ref = TeamCoordinator(m, distances=warm.distances) #costs as both saw them, with this turn's keep bonus
+        ref.assignment = dict(warm.assignment)
+
+        got = warm.assign(bots, tasks)
+        expected = cold.assign(bots, tasks)
+        by_key = {t.key: t for t in tasks}
+        cost = lambda result: sum(ref.cost(b, bots[b], by_key[k]) for b, k in result.items() if k is not None)
+        assert abs(cost(got) - cost(expected)) < 1e-9
+        assert sum(k is not None for k in got.values()) == sum(k is not None for k in expected.values())
+
+        #a couple of bots move
+        for bot_id in rng.sample(sorted(bots), 2):
+            bots[bot_id] = rng.choice(floor)
@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+
+from conftest import MAPS
+from game_constants import Team
+from obs_encoder import ObservationEncoder
+from vec_game import VecGame, DIRECTIONS, INTERACTIONS
+
+
+def test_observations_match_a_full_encode():
+    '''the incrementally updated batch rows equal a fresh encoder's output, also across auto-resets'''
+    env = VecGame(os.path.join(MAPS, "map1.txt"), num_envs=3, turn_limit=40)
+    rng = np.random.default_rng(0)
+    highs = np.array([len(DIRECTIONS), len(INTERACTIONS), len(DIRECTIONS)])
+    env.reset()
+    resets = 0
+    for _ in range(100):
+        obs, _, dones, _ = env.step(rng.integers(0, highs, size=env.action_shape))
+        resets += int(dones.sum())
+        for i, gs in enumerate(env.states):
+            for team in (Team.RED, Team.BLUE):
+                enc = ObservationEncoder(gs, team, turn_limit=40)
+                for key, arr in enc.encode().items():
+                    assert np.array_equal(obs[key][i, team.value], arr), key
+                enc.close()
+    env.close()
+    assert resets > 0